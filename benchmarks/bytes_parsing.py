@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Compares text and binary parse_file on wide report with mostly numeric columns:
+reading all values, reading few of them and memory used by parsed rows kept in list.
+
+    python benchmarks/bytes_parsing.py [rows] [numeric columns]
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from csvparser import parser, fields
+
+REPEATS = 7
+
+
+def create_parser_class(columns):
+    attrs = {'ad_id': fields.CharField(), 'date': fields.DateField('%Y-%m-%d')}
+    for i in range(columns):
+        if i % 4 == 3:
+            attrs['metric{}'.format(i)] = fields.DecimalField(null_symbols=['--'])
+        else:
+            attrs['metric{}'.format(i)] = fields.IntegerField(null_symbols=['--'])
+    attrs['fields_order'] = ['ad_id', 'date'] + ['metric{}'.format(i) for i in range(columns)]
+    return type(str('WideReportParser'), (parser.Parser,), attrs)
+
+
+def create_file(file_path, rows, columns):
+    with open(file_path, 'w') as file:
+        for row in range(rows):
+            values = ['{}.{:02d}'.format(row % 9000, i) if i % 4 == 3 else str(row * i % 100000)
+                      for i in range(columns)]
+            file.write('ad{},2016-09-30,{}\n'.format(row, ','.join(values)))
+
+
+def parse(parser_class, file_path, field_names, **kwargs):
+    start = time.time()
+    for row in parser_class.parse_file(file_path, **kwargs):
+        for name in field_names:
+            getattr(row, name)
+    return time.time() - start
+
+
+def measure_memory(parser_class, file_path, **kwargs):
+    tracemalloc.start()
+    try:
+        rows = list(parser_class.parse_file(file_path, **kwargs))
+        return tracemalloc.get_traced_memory()[0] / 1024.0 ** 2 if rows else 0.0
+    finally:
+        tracemalloc.stop()
+
+
+def compare(title, text_value, binary_value, unit):
+    print('{:<24} text {:8.3f}{unit}  binary {:8.3f}{unit}  ({:.2f}x)'.format(
+        title, text_value, binary_value, text_value / binary_value, unit=unit))
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    parser_class = create_parser_class(columns)
+    all_names = parser_class.fields_order
+    few_names = parser_class.fields_order[:5]
+
+    directory = tempfile.mkdtemp()
+    try:
+        file_path = os.path.join(directory, 'report.csv')
+        create_file(file_path, rows, columns)
+        print('{} rows, {} numeric columns, {:.1f} MB'.format(rows, columns, os.path.getsize(file_path) / 1024.0 ** 2))
+
+        for title, field_names in (('all values', all_names), ('5 values', few_names), ('no values', [])):
+            # runs of both modes are interleaved, so changing load of machine affects both of them
+            text_times, binary_times = [], []
+            for _ in range(REPEATS):
+                text_times.append(parse(parser_class, file_path, field_names))
+                binary_times.append(parse(parser_class, file_path, field_names, binary=True))
+            compare(title, min(text_times), min(binary_times), 's')
+        compare('memory of kept rows', measure_memory(parser_class, file_path),
+                measure_memory(parser_class, file_path, binary=True), 'MB')
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Compares eager and lazy parse_file on wide report when rows are filtered by one field,
+when one field of each row is read and when all fields are read.
+
+    python benchmarks/lazy_parsing.py [rows] [columns]
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from csvparser import parser, fields
+
+REPEATS = 7
+
+
+def create_parser_class(columns):
+    attrs = {'ad_id': fields.CharField()}
+    for i in range(columns):
+        attrs['metric{}'.format(i)] = fields.IntegerField(null_symbols=['--'])
+    attrs['fields_order'] = ['ad_id'] + ['metric{}'.format(i) for i in range(columns)]
+    return type(str('WideReportParser'), (parser.Parser,), attrs)
+
+
+def create_file(file_path, rows, columns):
+    with open(file_path, 'w') as file:
+        for row in range(rows):
+            values = [str(row * i % 100000) for i in range(columns)]
+            # every tenth record is quoted, so it is tokenized by csv reader
+            ad_id = '"ad,{}"'.format(row) if row % 10 == 0 else 'ad{}'.format(row)
+            file.write('{},{}\n'.format(ad_id, ','.join(values)))
+
+
+def parse(parser_class, file_path, field_names, **kwargs):
+    start = time.time()
+    for row in parser_class.parse_file(file_path, **kwargs):
+        for name in field_names:
+            getattr(row, name)
+    return time.time() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    parser_class = create_parser_class(columns)
+
+    directory = tempfile.mkdtemp()
+    try:
+        file_path = os.path.join(directory, 'report.csv')
+        create_file(file_path, rows, columns)
+        print('{} rows, {} columns, {:.1f} MB'.format(rows, columns, os.path.getsize(file_path) / 1024.0 ** 2))
+
+        for title, field_names in (('no values', []), ('1 value', ['ad_id']),
+                                   ('all values', parser_class.fields_order)):
+            # runs of both modes are interleaved, so changing load of machine affects both of them
+            eager_times, lazy_times = [], []
+            for _ in range(REPEATS):
+                eager_times.append(parse(parser_class, file_path, field_names))
+                lazy_times.append(parse(parser_class, file_path, field_names, lazy=True))
+            eager_time, lazy_time = min(eager_times), min(lazy_times)
+            print('{:<12} eager {:8.3f}s  lazy {:8.3f}s  ({:.2f}x)'.format(
+                title, eager_time, lazy_time, eager_time / lazy_time))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
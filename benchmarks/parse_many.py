@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Compares parse_file in loop with Parser.parse_many on files with skewed sizes
+(many small files and few big ones). Rows are validated in both cases.
+
+    python benchmarks/parse_many.py [files] [workers]
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import decimal
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from csvparser import parser, fields, validators
+
+
+class AdPerformanceReportParser(parser.Parser):
+    impressions = fields.IntegerField(validators=[validators.IntegerFieldMinValidator(min_value=0)])
+    clicks = fields.IntegerField(validators=[validators.IntegerFieldMinValidator(min_value=0)])
+    conversions = fields.IntegerField(validators=[validators.IntegerFieldMinValidator(min_value=0)])
+    cost = fields.DecimalField(validators=[validators.DecimalFieldMaxValidator(max_value=decimal.Decimal('5000.00'))])
+    ad_id = fields.CharField(validators=[validators.CharFieldMaxLengthValidator(max_length=20)])
+
+    fields_order = ['impressions', 'clicks', 'conversions', 'cost', 'ad_id']
+
+
+def create_files(directory, files):
+    random.seed(0)
+    total_rows = 0
+    for i in range(files):
+        rows = min(int(random.paretovariate(0.8) * 20), 400000)
+        total_rows += rows
+        with open(os.path.join(directory, 'report{}.csv'.format(i)), 'w') as file:
+            file.write('impressions,clicks,conversions,cost,ad_id\n')
+            for row in range(rows):
+                file.write('{0},{1},{2},{3}.{4:02d},{5}\n'.format(row, row % 1000, row % 10, row % 9000, row % 100,
+                                                                 1000000 + row))
+    return total_rows
+
+
+def parse_in_loop(directory):
+    invalid_rows = 0
+    for name in sorted(os.listdir(directory)):
+        for row in AdPerformanceReportParser.parse_file(os.path.join(directory, name), start_from_line=2):
+            if not row.is_valid():
+                invalid_rows += 1
+    return invalid_rows
+
+
+def parse_many(directory, workers):
+    result = AdPerformanceReportParser.parse_many(os.path.join(directory, '*.csv'), workers=workers,
+                                                  start_from_line=2, validate=True, split_size=4 * 1024 * 1024)
+    for item in result:
+        pass
+    return result.stats.total.invalid_rows
+
+
+def main(files, workers):
+    directory = tempfile.mkdtemp()
+    try:
+        total_rows = create_files(directory, files)
+        sizes = sorted((os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)),
+                       reverse=True)
+        print('{files} files, {rows} rows, biggest files: {sizes} bytes'.format(files=files, rows=total_rows,
+                                                                                sizes=sizes[:3]))
+
+        start = time.time()
+        invalid_rows = parse_in_loop(directory)
+        print('parse_file loop    {:.2f} s, invalid rows {}'.format(time.time() - start, invalid_rows))
+
+        start = time.time()
+        invalid_rows = parse_many(directory, workers)
+        print('parse_many({})      {:.2f} s, invalid rows {}'.format(workers, time.time() - start, invalid_rows))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500, int(sys.argv[2]) if len(sys.argv) > 2 else 4)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Measures startup of short-lived worker: import csvparser, define parser class and parse first row.
+Each measurement runs in new process, with plan compiled in worker and with plan loaded from parent.
+
+    python benchmarks/startup.py [runs]
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLUMNS = 80
+
+
+def define_parser():
+    from csvparser import parser, fields
+
+    attrs = {'column{}'.format(i): fields.IntegerField() for i in range(COLUMNS)}
+    attrs['fields_order'] = ['column{}'.format(i) for i in range(COLUMNS)]
+    attrs['__module__'] = __name__
+    globals()['WideReportParser'] = type(str('WideReportParser'), (parser.Parser,), attrs)
+    return globals()['WideReportParser']
+
+
+def worker(csv_path, plans_path):
+    start = time.time()
+    from csvparser import plan
+
+    parser_class = define_parser()
+    imported = time.time()
+
+    if plans_path:
+        with open(plans_path, 'rb') as plans_file:
+            plan.load_plans(plans_file.read())
+
+    row = next(parser_class.parse_file(csv_path))
+    list(row)
+    finished = time.time()
+    print(imported - start, finished - imported)
+
+
+def measure(csv_path, plans_path, runs):
+    import_times, first_row_times, totals = [], [], []
+    for _ in range(runs):
+        start = time.time()
+        output = subprocess.check_output([sys.executable, __file__, '--worker', csv_path, plans_path],
+                                         cwd=ROOT, env=dict(os.environ, PYTHONPATH=ROOT))
+        totals.append(time.time() - start)
+        import_time, first_row_time = map(float, output.split())
+        import_times.append(import_time)
+        first_row_times.append(first_row_time)
+
+    return min(import_times), min(first_row_times), min(totals)
+
+
+def main(runs):
+    directory = tempfile.mkdtemp()
+    csv_path = os.path.join(directory, 'report.csv')
+    plans_path = os.path.join(directory, 'plans.bin')
+
+    with open(csv_path, 'w') as csv_file:
+        csv_file.write(','.join(str(i) for i in range(COLUMNS)) + '\n')
+
+    subprocess.check_call([sys.executable, __file__, '--dump', plans_path], cwd=ROOT,
+                          env=dict(os.environ, PYTHONPATH=ROOT))
+
+    try:
+        for name, path in (('compiled in worker', ''), ('loaded from parent', plans_path)):
+            import_time, first_row_time, total = measure(csv_path, path, runs)
+            print('{name:20} import+class {import_time:.2f} ms, first row {first_row_time:.2f} ms, '
+                  'process {total:.2f} ms'.format(name=name, import_time=import_time * 1000,
+                                                   first_row_time=first_row_time * 1000, total=total * 1000))
+    finally:
+        shutil.rmtree(directory)
+
+
+def dump(plans_path):
+    from csvparser import plan
+
+    with open(plans_path, 'wb') as plans_file:
+        plans_file.write(plan.dump_plans([define_parser()]))
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--worker']:
+        worker(sys.argv[2], sys.argv[3])
+    elif sys.argv[1:2] == ['--dump']:
+        dump(sys.argv[2])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
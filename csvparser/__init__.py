@@ -3,4 +3,14 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 from . import parser
 from . import fields
-from . import validators
\ No newline at end of file
+from . import validators
+from . import writers
+from . import index
+from . import follow
+from . import plan
+from . import columns
+from . import cache
+from . import parallel
+from . import shared
+from . import inference
+from . import binary
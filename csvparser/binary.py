@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import codecs
+import csv
+
+from .fields import ParserField
+from .plan import create_row_subclass
+from .lazy import get_quotechar, get_dialect_attribute, can_split_records
+
+# encodings in which bytes of ASCII characters never appear inside multibyte characters
+SPLITTABLE_ENCODINGS = ('utf-8', 'ascii', 'latin-1', 'iso8859', 'cp125')
+
+
+def is_splittable_encoding(encoding):
+    return codecs.lookup(encoding).name.startswith(SPLITTABLE_ENCODINGS)
+
+
+class BytesTokenizer(object):
+    """
+    Splits raw records read in binary mode into bytes cells. Records without quotechar are split
+    on delimiter without decoding, other records are decoded, tokenized by csv reader and encoded back.
+    """
+    def __init__(self, csv_reader, reader_kwargs, encoding):
+        if '\n,"'.encode(encoding) != b'\n,"':
+            raise ValueError('binary parsing requires ASCII compatible encoding, got {encoding}'.format(
+                encoding=encoding))
+
+        if get_dialect_attribute(reader_kwargs, 'quoting') == csv.QUOTE_NONNUMERIC:
+            raise ValueError('binary parsing can not be used with QUOTE_NONNUMERIC, cells have to stay bytes')
+
+        self.csv_reader = csv_reader
+        self.reader_kwargs = reader_kwargs
+        self.encoding = encoding
+
+        quotechar = get_quotechar(reader_kwargs)
+        self.quotechar = quotechar.encode(encoding) if quotechar else None
+        self.delimiter = get_dialect_attribute(reader_kwargs, 'delimiter').encode(encoding)
+        self.can_split = can_split_records(csv_reader, reader_kwargs) and is_splittable_encoding(encoding)
+
+    def __call__(self, raw_record):
+        if self.can_split and (self.quotechar is None or self.quotechar not in raw_record):
+            raw_record = raw_record.rstrip(b'\r\n')
+            if not raw_record:
+                return []
+            return raw_record.split(self.delimiter)
+
+        row = next(self.csv_reader([raw_record.decode(self.encoding)], **self.reader_kwargs), [])
+        return [cell.encode(self.encoding) for cell in row]
+
+
+class BytesFieldReader(object):
+    """
+    Descriptor used instead of field on rows parsed with binary=True. Converts bytes raw value with converter
+    bound once per field and encoding, values assigned after parsing are converted by field itself.
+    """
+    def __init__(self, field, encoding):
+        self.field = field
+        self.name = field.name
+        self.encoding = encoding
+        self.convert = field.create_bytes_converter(encoding)
+        if field.null_symbols is None:
+            self.null_symbols = None
+        else:
+            self.null_symbols = [symbol.encode(encoding) for symbol in field.null_symbols]
+
+    def __get__(self, instance, cls):
+        if instance is None:
+            return self.field
+
+        try:
+            raw_value = instance.__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+        if raw_value.__class__ is not bytes:
+            return self.field.__get__(instance, cls)
+
+        if self.null_symbols is not None and raw_value in self.null_symbols:
+            return None
+        return self.convert(raw_value)
+
+    def __set__(self, instance, value):
+        self.field.__set__(instance, value)
+
+
+def create_binary_class(plan, encoding):
+    """
+    Returns subclass of parser class for rows parsed with binary=True, which reads parser fields
+    with BytesFieldReader
+    """
+    descriptors = dict((field_name, BytesFieldReader(field, encoding))
+                       for field_name, field in zip(plan.field_names, plan.fields) if isinstance(field, ParserField))
+    return create_row_subclass(plan, (create_binary_class, encoding), descriptors, parser_encoding=encoding)
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+from .columns import ColumnsBuilder, ColumnsReader, ColumnEncodeError
+from .plan import create_row_subclass
+
+MAGIC = b'CSVPARSERCACHE1\n'
+HEADER_LENGTH = struct.Struct(str('<Q'))
+FILE_SUFFIX = '.csvpcache'
+
+
+class ResultCache(object):
+    """
+    On-disk cache of parse_file results. Real values of rows are stored in columnar format
+    (see csvparser.columns), keyed by file path, size, modification time, parse arguments
+    and schema hash of parser class, so changes of file or field declarations invalidate it.
+    Least recently used entries are removed when size of directory exceeds max_size bytes.
+    """
+    def __init__(self, directory, max_size=1024 ** 3):
+        self.directory = directory
+        self.max_size = max_size
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def get_key(self, parser_class, file_path, start_from_line, csv_reader, reader_kwargs):
+        """
+        Returns '{path hash}-{arguments hash}-{file version hash}'. Entries which differ only in file version
+        (size, modification time) are older results of the same parse and are replaced by new entry.
+        """
+        file_path = os.path.abspath(file_path)
+        file_stat = os.stat(file_path)
+        arguments = repr((
+            start_from_line,
+            getattr(csv_reader, '__module__', None), getattr(csv_reader, '__name__', repr(csv_reader)),
+            sorted((name, repr(value)) for name, value in reader_kwargs.items()),
+            parser_class.get_plan(refresh=True).schema_hash,
+        ))
+        file_version = repr((file_stat.st_size, file_stat.st_mtime_ns))
+
+        return '{path_hash}-{arguments_hash}-{file_version_hash}'.format(
+            path_hash=hashlib.sha1(file_path.encode('utf-8')).hexdigest()[:16],
+            arguments_hash=hashlib.sha1(arguments.encode('utf-8')).hexdigest(),
+            file_version_hash=hashlib.sha1(file_version.encode('utf-8')).hexdigest()[:16])
+
+    def get_entry_path(self, key):
+        return os.path.join(self.directory, key + FILE_SUFFIX)
+
+    def parse_file(self, parser_class, file_path, start_from_line=1, csv_reader=csv.reader, **kwargs):
+        """Yields rows from cache, or parses file and stores rows in cache when all of them were read"""
+        key = self.get_key(parser_class, file_path, start_from_line, csv_reader, kwargs)
+        rows = self.load(parser_class, key)
+
+        if rows is None:
+            rows = self.parse_and_store(parser_class, key, file_path, start_from_line, csv_reader, kwargs)
+
+        for row in rows:
+            yield row
+
+    def parse_and_store(self, parser_class, key, file_path, start_from_line, csv_reader, reader_kwargs):
+        builder = ColumnsBuilder(parser_class.get_plan())
+        can_be_stored = True
+
+        for instance in parser_class.parse_file(file_path, start_from_line, csv_reader, **reader_kwargs):
+            if can_be_stored:
+                try:
+                    builder.append(instance)
+                except (ValueError, ArithmeticError, TypeError):
+                    # row which can not be converted is not cached, it will be parsed again next time
+                    can_be_stored = False
+            yield instance
+
+        if can_be_stored:
+            try:
+                self.store(key, builder)
+            except ColumnEncodeError:
+                pass
+
+    def load(self, parser_class, key):
+        """Returns list of rows stored under key or None"""
+        entry_path = self.get_entry_path(key)
+        try:
+            entry_file = open(entry_path, 'rb')
+        except (IOError, OSError):
+            return None
+
+        with entry_file:
+            if entry_file.read(len(MAGIC)) != MAGIC:
+                return None
+            header_length, = HEADER_LENGTH.unpack(entry_file.read(HEADER_LENGTH.size))
+            header = json.loads(entry_file.read(header_length).decode('utf-8'))
+            data_offset = len(MAGIC) + HEADER_LENGTH.size + header_length
+
+            if header['row_count'] == 0:
+                columns = [[] for _ in header['layout']]
+            else:
+                data = mmap.mmap(entry_file.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    reader = ColumnsReader(memoryview(data)[data_offset:], header['layout'], header['row_count'])
+                    columns = [reader.column(i) for i in range(len(header['layout']))]
+                    reader.release()
+                finally:
+                    data.close()
+
+        os.utime(entry_path, None)
+
+        plan = parser_class.get_plan()
+        kinds = tuple(column['kind'] for column in header['layout'])
+        cached_class = plan.get_row_class(create_cached_class, kinds)
+        # raw values of custom fields are converted on access, like in parsed rows
+        attribute_names = [field.name if kind == 'raw' else field.value_name for field, kind in zip(plan.fields, kinds)]
+
+        rows = []
+        for values in zip(*columns):
+            instance = cached_class()
+            instance.__dict__.update(zip(attribute_names, values))
+            rows.append(instance)
+        return rows
+
+    def store(self, key, builder):
+        layout, data = builder.encode()
+        header_bytes = json.dumps({'row_count': builder.row_count, 'layout': layout}).encode('utf-8')
+        # data starts at offset aligned to 8 bytes, so int64 arrays can be cast without copying
+        header_bytes += b' ' * (-(len(MAGIC) + HEADER_LENGTH.size + len(header_bytes)) % 8)
+
+        handle, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as entry_file:
+                entry_file.write(MAGIC)
+                entry_file.write(HEADER_LENGTH.pack(len(header_bytes)))
+                entry_file.write(header_bytes)
+                entry_file.write(data)
+            self.remove_older_versions(key)
+            os.rename(temporary_path, self.get_entry_path(key))
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+        self.evict()
+
+    def remove_older_versions(self, key):
+        """Removes entries of previous versions of the same file parsed with the same parser and arguments"""
+        prefix = key.rsplit('-', 1)[0] + '-'
+        for entry_name in os.listdir(self.directory):
+            if entry_name.startswith(prefix) and entry_name.endswith(FILE_SUFFIX):
+                self.remove(os.path.join(self.directory, entry_name))
+
+    def evict(self):
+        entries = []
+        for entry_name in os.listdir(self.directory):
+            if entry_name.endswith(FILE_SUFFIX):
+                entry_path = os.path.join(self.directory, entry_name)
+                try:
+                    entry_stat = os.stat(entry_path)
+                except (IOError, OSError):
+                    continue
+                entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+
+        total_size = sum(size for modification_time, size, entry_path in entries)
+        for modification_time, size, entry_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            self.remove(entry_path)
+            total_size -= size
+
+    def clear(self):
+        for entry_name in os.listdir(self.directory):
+            if entry_name.endswith(FILE_SUFFIX):
+                self.remove(os.path.join(self.directory, entry_name))
+
+    @staticmethod
+    def remove(entry_path):
+        try:
+            os.remove(entry_path)
+        except (IOError, OSError):
+            pass
+
+
+class CachedFieldReader(object):
+    """
+    Descriptor used instead of field on rows loaded from cache. Returns stored real value,
+    values assigned after loading are stored as raw values and converted by field.
+    """
+    def __init__(self, field):
+        self.field = field
+        self.value_name = field.value_name
+
+    def __get__(self, instance, cls):
+        if instance is None:
+            return self.field
+
+        try:
+            return instance.__dict__[self.value_name]
+        except KeyError:
+            return self.field.__get__(instance, cls)
+
+    def __set__(self, instance, value):
+        instance.__dict__.pop(self.value_name, None)
+        self.field.__set__(instance, value)
+
+
+def create_cached_class(plan, kinds):
+    """Returns subclass of parser class for rows loaded from cache, kinds are column kinds of cache entry"""
+    descriptors = dict((field_name, CachedFieldReader(field))
+                       for field_name, field, kind in zip(plan.field_names, plan.fields, kinds) if kind != 'raw')
+    return create_row_subclass(plan, (create_cached_class, kinds), descriptors)
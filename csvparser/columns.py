@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import array
+import datetime
+import decimal
+import sys
+
+from . import fields
+
+EPOCH = datetime.datetime(1970, 1, 1)
+ALIGNMENT = 8
+
+
+class ColumnEncodeError(ValueError):
+    pass
+
+
+def get_column_kind(field):
+    """
+    Returns how values of field are stored in columns. Subclasses of builtin fields can override
+    create_real_value, so only builtin fields are stored as typed values. Other fields store raw strings.
+    """
+    field_type = type(field)
+    if field_type is fields.IntegerField:
+        return 'int'
+    elif field_type is fields.DateField:
+        return 'datetime'
+    elif field_type is fields.DecimalField:
+        return 'decimal'
+    elif field_type is fields.CharField:
+        return 'text'
+    else:
+        return 'raw'
+
+
+class ColumnsBuilder(object):
+    """
+    Collects values of rows and encodes them as columns: one null byte per row and int64 array
+    (int, datetime as microseconds since epoch) or string table (int64 offsets and utf-8 data).
+    """
+    def __init__(self, plan):
+        self.plan = plan
+        self.kinds = [get_column_kind(field) for field in plan.fields]
+        self.columns = [[] for _ in plan.fields]
+        self.row_count = 0
+
+    def append(self, instance):
+        for field_name, field, kind, column in zip(self.plan.field_names, self.plan.fields, self.kinds, self.columns):
+            if kind == 'raw':
+                raw_value = getattr(instance, field.name)
+                if raw_value.__class__ is bytes:
+                    # row parsed with binary=True
+                    raw_value = raw_value.decode(instance.parser_encoding)
+                column.append(raw_value)
+            else:
+                column.append(getattr(instance, field_name))
+        self.row_count += 1
+
+    def encode(self):
+        """Returns (layout, data). Raises ColumnEncodeError when value can not be stored."""
+        data = bytearray()
+        layout = []
+
+        for field_name, kind, column in zip(self.plan.field_names, self.kinds, self.columns):
+            nulls = bytearray(value is None for value in column)
+            layout_column = {'name': field_name, 'kind': kind, 'nulls': append_aligned(data, nulls)}
+
+            if kind == 'int' or kind == 'datetime':
+                try:
+                    values = array.array(str('q'), [encode_int64(kind, value) for value in column])
+                except OverflowError:
+                    raise ColumnEncodeError('{field_name} value does not fit int64'.format(field_name=field_name))
+                layout_column['values'] = append_aligned(data, to_little_endian(values))
+            else:
+                texts = [encode_text(kind, value) for value in column]
+                offsets = array.array(str('q'), [0])
+                position = 0
+                for text in texts:
+                    position += len(text)
+                    offsets.append(position)
+                layout_column['offsets'] = append_aligned(data, to_little_endian(offsets))
+                layout_column['text'] = append_aligned(data, ''.join(texts).encode('utf-8'))
+
+            layout.append(layout_column)
+
+        return layout, data
+
+
+def encode_int64(kind, value):
+    if value is None:
+        return 0
+    elif kind == 'int':
+        return value
+    elif value.tzinfo is not None:
+        raise ColumnEncodeError('datetime with timezone can not be stored')
+    else:
+        delta = value - EPOCH
+        return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def encode_text(kind, value):
+    if value is None:
+        return ''
+    elif kind == 'raw' and not isinstance(value, type('')):
+        raise ColumnEncodeError('raw value has to be string')
+    else:
+        return '{}'.format(value)
+
+
+def datetime_from_int64(value):
+    return EPOCH + datetime.timedelta(microseconds=value)
+
+
+def convert_value(convert, value):
+    return convert(value)
+
+
+def convert_nullable_value(convert, value):
+    if value is None:
+        return None
+    return convert(value)
+
+
+def append_aligned(data, chunk):
+    data.extend(b'\0' * (-len(data) % ALIGNMENT))
+    offset = len(data)
+    data.extend(chunk)
+    return offset, len(chunk)
+
+
+def to_little_endian(values):
+    if sys.byteorder != 'little':
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class ColumnsReader(object):
+    """
+    Reads columns encoded by ColumnsBuilder from buffer (bytes, mmap, shared memory) without copying
+    numeric arrays. Strings of text columns are decoded once per column, on first use.
+    """
+    def __init__(self, buffer, layout, row_count):
+        self.buffer = memoryview(buffer)
+        self.layout = layout
+        self.row_count = row_count
+        self.positions = dict((column['name'], i) for i, column in enumerate(layout))
+        self.texts = {}
+
+    def chunk(self, position):
+        offset, length = position
+        return self.buffer[offset:offset + length]
+
+    def int64_array(self, position):
+        chunk = self.chunk(position)
+        if sys.byteorder != 'little':
+            values = array.array(str('q'), chunk.tobytes())
+            values.byteswap()
+            return values
+        return chunk.cast('q')
+
+    def nulls(self, column_index):
+        return self.chunk(self.layout[column_index]['nulls'])
+
+    def text(self, column_index):
+        if column_index not in self.texts:
+            column = self.layout[column_index]
+            self.texts[column_index] = (self.int64_array(column['offsets']),
+                                        bytes(self.chunk(column['text'])).decode('utf-8'))
+        return self.texts[column_index]
+
+    def value(self, column_index, row_index):
+        """Returns single value, raw columns return raw string"""
+        if self.nulls(column_index)[row_index]:
+            return None
+
+        column = self.layout[column_index]
+        kind = column['kind']
+        if kind == 'int':
+            return self.int64_array(column['values'])[row_index]
+        elif kind == 'datetime':
+            return datetime_from_int64(self.int64_array(column['values'])[row_index])
+
+        offsets, text = self.text(column_index)
+        value = text[offsets[row_index]:offsets[row_index + 1]]
+        if kind == 'decimal':
+            return decimal.Decimal(value)
+        return value
+
+    def column(self, column_index):
+        """Returns list of all values of column, raw columns return raw strings"""
+        column = self.layout[column_index]
+        kind = column['kind']
+        nulls = self.nulls(column_index).tolist()
+
+        if kind == 'int' or kind == 'datetime':
+            values = self.int64_array(column['values']).tolist()
+        else:
+            offsets, text = self.text(column_index)
+            offsets = offsets.tolist()
+            values = [text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+        if any(nulls):
+            values = [None if is_null else value for is_null, value in zip(nulls, values)]
+            convert = convert_nullable_value
+        else:
+            convert = convert_value
+
+        if kind == 'datetime':
+            values = [convert(datetime_from_int64, value) for value in values]
+        elif kind == 'decimal':
+            values = [convert(decimal.Decimal, value) for value in values]
+
+        return values
+
+    def release(self):
+        self.texts = {}
+        self.buffer.release()
@@ -1,9 +1,11 @@
 import decimal
 import datetime
+import operator
 
 
 class ParserField(object):
     fields_counter = 0
+    sql_type = 'TEXT'
 
     def __init__(self, validators=None, null_symbols=None):
         if validators is None:
@@ -16,6 +18,7 @@ class ParserField(object):
         self.init_done = False
         self.name = '_parser_field' + str(ParserField.fields_counter)
         self.errors_field_name = '_parser_field_errors' + str(ParserField.fields_counter)
+        self.value_name = '_parser_field_value' + str(ParserField.fields_counter)
         ParserField.fields_counter += 1
 
     def __get__(self, instance, cls):
@@ -32,19 +35,32 @@ class ParserField(object):
     def __set__(self, instance, value):
         setattr(instance, self.name, value)
 
-    def is_valid(self, instance, cls, field_name):
-        value = self.__get__(instance, cls)
-        setattr(instance, self.errors_field_name, [])
-        validation_results = []
-
-        for validator in self.validators:
-            field_is_valid = validator.is_valid(self.create_real_value(value), field_name)
-            if not field_is_valid:
-                current_errors = getattr(instance, self.errors_field_name)
-                current_errors.extend(validator.errors)
-            validation_results.append(field_is_valid)
-
-        return all(validation_results)
+    def is_valid(self, instance, cls, field_name, fail_fast=False):
+        """
+        Validates value of field on instance and stores errors on instance. With fail_fast=True
+        validation stops at first failing validator.
+        """
+        # through attribute of class, rows parsed with binary=True have their own descriptors
+        value = getattr(instance, field_name)
+        errors = []
+        setattr(instance, self.errors_field_name, errors)
+
+        failed_validators = self.run_validators(value, field_name, self.validators, fail_fast, errors)
+        return not failed_validators
+
+    @staticmethod
+    def run_validators(value, field_name, validators, fail_fast, errors):
+        """Runs validators in given order, extends errors and returns list of failed validators"""
+        failed_validators = []
+
+        for validator in validators:
+            if not validator.is_valid(value, field_name):
+                errors.extend(validator.errors)
+                failed_validators.append(validator)
+                if fail_fast:
+                    break
+
+        return failed_validators
 
     def errors(self, instance):
         return getattr(instance, self.errors_field_name)
@@ -52,21 +68,104 @@ class ParserField(object):
     def create_real_value(self, raw_value):
         pass
 
+    def create_bytes_converter(self, encoding):
+        """
+        Returns function converting raw value read with binary=True (bytes) to real value.
+        Fields which can convert bytes without decoding them override it.
+        """
+        create_real_value = self.create_real_value
+
+        def convert(raw_value):
+            return create_real_value(raw_value.decode(encoding))
+
+        return convert
+
+    def overrides_create_real_value(self, field_class):
+        """Checks if subclass of field_class changed create_real_value, so its bytes converter can not be used"""
+        return type(self).create_real_value is not field_class.create_real_value
+
+    def create_raw_value(self, real_value):
+        """
+        Inverse of create_real_value, used by writers. Override it in custom fields which should be written back.
+        """
+        return str(real_value)
+
+    def create_json_value(self, real_value):
+        return self.create_raw_value(real_value)
+
+    def create_sql_value(self, real_value):
+        return self.create_raw_value(real_value)
+
+    def null_raw_value(self):
+        if self.null_symbols:
+            return self.null_symbols[0]
+        else:
+            return ''
+
+
+# flag of code object of function which accepts **kwargs
+CO_VARKEYWORDS = 0x08
+
+
+def accepts_fail_fast(field):
+    """
+    Returns True when is_valid of field accepts fail_fast. Custom fields written before it was added
+    override is_valid(self, instance, cls, field_name), they are validated without it.
+    """
+    code = getattr(getattr(type(field), 'is_valid', None), '__code__', None)
+    if code is None:
+        return False
+
+    arguments = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+    return 'fail_fast' in arguments or bool(code.co_flags & CO_VARKEYWORDS)
+
 
 class CharField(ParserField):
     def create_real_value(self, raw_value):
         return raw_value
 
+    def create_bytes_converter(self, encoding):
+        if self.overrides_create_real_value(CharField):
+            return super(CharField, self).create_bytes_converter(encoding)
+        return operator.methodcaller('decode', encoding)
+
+    def create_raw_value(self, real_value):
+        return real_value
+
 
 class DecimalField(ParserField):
     def create_real_value(self, raw_value):
         return decimal.Decimal(raw_value)
 
+    def create_bytes_converter(self, encoding):
+        if self.overrides_create_real_value(DecimalField):
+            return super(DecimalField, self).create_bytes_converter(encoding)
+
+        def convert(raw_value):
+            # Decimal does not accept bytes, digits are ASCII, so default (utf-8) decoding is correct for all
+            # ASCII compatible encodings and it is the fastest one
+            return decimal.Decimal(raw_value.decode())
+
+        return convert
+
 
 class IntegerField(ParserField):
+    sql_type = 'INTEGER'
+
     def create_real_value(self, raw_value):
         return int(raw_value)
 
+    def create_bytes_converter(self, encoding):
+        if self.overrides_create_real_value(IntegerField):
+            return super(IntegerField, self).create_bytes_converter(encoding)
+        return int
+
+    def create_json_value(self, real_value):
+        return real_value
+
+    def create_sql_value(self, real_value):
+        return real_value
+
 
 class DateField(ParserField):
     def __init__(self, date_format, **kwargs):
@@ -74,4 +173,7 @@ class DateField(ParserField):
         self.date_format = date_format
 
     def create_real_value(self, raw_value):
-        return datetime.datetime.strptime(raw_value, self.date_format)
\ No newline at end of file
+        return datetime.datetime.strptime(raw_value, self.date_format)
+
+    def create_raw_value(self, real_value):
+        return real_value.strftime(self.date_format)
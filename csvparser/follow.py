@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import csv
+import io
+import os
+import time
+
+from .lazy import get_quotechar
+
+
+def split_complete_records(data, quotechar=b'"'):
+    """
+    Splits bytes into complete records and remaining tail. Record is complete when it ends with newline
+    and has even number of quotechars, so newlines inside quoted values do not end record.
+    Returns (list of records, offset of tail).
+    """
+    records = []
+    record_start = 0
+    line_start = 0
+    quotes = 0
+
+    while True:
+        newline = data.find(b'\n', line_start)
+        if newline == -1:
+            break
+
+        if quotechar:
+            quotes += data.count(quotechar, line_start, newline)
+        line_start = newline + 1
+
+        if quotes % 2 == 0:
+            records.append(data[record_start:line_start])
+            record_start = line_start
+            quotes = 0
+
+    return records, record_start
+
+
+class FileFollower(object):
+    """
+    Yields rows appended to file, like tail -f. Keeps byte offset of last complete record in self.offset,
+    partial trailing lines are kept until they are completed. Rotated (replaced) and truncated files are
+    read again from the beginning, so start_from_line is applied to them too.
+    Stops when stop_event is set and all available data was read, or when no data arrived for idle_timeout seconds.
+    Polling interval is doubled while file is idle, up to max_poll_interval.
+    """
+    def __init__(self, parser_class, file_path, start_from_line=1, csv_reader=csv.reader, encoding='utf-8',
+                 poll_interval=0.05, max_poll_interval=1.0, stop_event=None, idle_timeout=None, **kwargs):
+        self.parser_class = parser_class
+        self.file_path = file_path
+        self.start_from_line = start_from_line
+        self.csv_reader = csv_reader
+        self.encoding = encoding
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.stop_event = stop_event
+        self.idle_timeout = idle_timeout
+        self.reader_kwargs = kwargs
+
+        quotechar = get_quotechar(kwargs)
+        self.quotechar = quotechar.encode(encoding) if quotechar else None
+
+        self.file = None
+        self.offset = 0
+        self.buffer = b''
+        self.lines_to_skip = 0
+
+    def __iter__(self):
+        self.parser_class.get_plan(refresh=True)
+
+        try:
+            self.open()
+            interval = self.poll_interval
+            last_data_time = time.time()
+
+            while True:
+                records = self.read_records()
+                if records:
+                    interval = self.poll_interval
+                    last_data_time = time.time()
+                    for instance in self.parse_records(records):
+                        yield instance
+                    continue
+
+                if self.stop_event is not None and self.stop_event.is_set():
+                    break
+
+                if self.idle_timeout is not None and time.time() - last_data_time > self.idle_timeout:
+                    break
+
+                if self.file_was_replaced():
+                    records = self.read_records(flush_tail=True)
+                    for instance in self.parse_records(records):
+                        yield instance
+                    self.open()
+                    continue
+
+                if self.file_was_truncated():
+                    self.file.seek(0)
+                    self.reset()
+                    continue
+
+                time.sleep(interval)
+                interval = min(interval * 2, self.max_poll_interval)
+        finally:
+            self.close()
+
+    def open(self):
+        self.close()
+        while True:
+            try:
+                self.file = open(self.file_path, 'rb')
+                break
+            except (IOError, OSError):
+                if self.stop_event is not None and self.stop_event.is_set():
+                    raise
+                time.sleep(self.poll_interval)
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.buffer = b''
+        self.lines_to_skip = self.start_from_line - 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def read_records(self, flush_tail=False):
+        data = self.file.read()
+        if data:
+            self.buffer += data
+
+        records, tail_offset = split_complete_records(self.buffer, self.quotechar)
+        if flush_tail and tail_offset < len(self.buffer):
+            records.append(self.buffer[tail_offset:])
+            tail_offset = len(self.buffer)
+
+        self.offset += tail_offset
+        self.buffer = self.buffer[tail_offset:]
+        return records
+
+    def parse_records(self, records):
+        text = b''.join(records).decode(self.encoding)
+        reader = self.csv_reader(io.StringIO(text, newline=''), **self.reader_kwargs)
+
+        for row in reader:
+            if self.lines_to_skip:
+                self.lines_to_skip -= 1
+                continue
+            yield self.parser_class.create_instance(row)
+
+    def file_was_replaced(self):
+        try:
+            path_stat = os.stat(self.file_path)
+        except (IOError, OSError):
+            return False
+
+        file_stat = os.fstat(self.file.fileno())
+        return (path_stat.st_ino, path_stat.st_dev) != (file_stat.st_ino, file_stat.st_dev)
+
+    def file_was_truncated(self):
+        return os.fstat(self.file.fileno()).st_size < self.offset + len(self.buffer)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import csv
+
+from .binary import is_splittable_encoding
+
+
+class DuplicateKeyError(ValueError):
+    pass
+
+
+class OffsetTrackingFile(object):
+    """
+    Iterates over lines of file and keeps offset of next line without calling tell() for every line.
+    Binary files and text files with ASCII compatible encoding are read as bytes and offset is sum
+    of byte lengths of lines, so tell() returns byte offset (see byte_offsets). Lines of text files and,
+    when encoding is given, of binary files are decoded. Other text files are read with readline
+    and tell() of file is used.
+    """
+    def __init__(self, file, encoding=None):
+        self.file = file
+        self.encoding = encoding
+        self.lines = None
+        self.offset = None
+
+        if not hasattr(file, 'encoding'):
+            self.lines = iter(file)
+            self.offset = file.tell()
+            return
+
+        buffer = getattr(file, 'buffer', None)
+        if buffer is not None and file.encoding and is_splittable_encoding(file.encoding):
+            offset = file.tell()
+            # text file which already read ahead from buffer has to be read by itself
+            if offset == buffer.tell():
+                self.lines = iter(buffer)
+                self.offset = offset
+                self.encoding = file.encoding
+
+    @property
+    def byte_offsets(self):
+        return self.offset is not None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.lines is None:
+            line = self.file.readline()
+            if not line:
+                raise StopIteration
+            return line
+
+        line = next(self.lines)
+        self.offset += len(line)
+        if self.encoding is not None:
+            return line.decode(self.encoding)
+        return line
+
+    next = __next__
+
+    def tell(self):
+        if self.offset is None:
+            return self.file.tell()
+        return self.offset
+
+
+class KeyIndex(object):
+    """
+    Maps key of row to offset of row in parsed file. Built by Parser.parse_file(..., index=index).
+    Stores only offsets, rows are read again from file by fetch and rows.
+    """
+    policies = ('first', 'last', 'error')
+
+    def __init__(self, parser_class, key, policy='first'):
+        if policy not in self.policies:
+            raise ValueError('policy has to be one of {policies}'.format(policies=', '.join(self.policies)))
+
+        if isinstance(key, (tuple, list)):
+            self.key_fields = tuple(key)
+        else:
+            self.key_fields = (key,)
+
+        for field_name in self.key_fields:
+            if field_name not in parser_class.get_all_field_names_declared_by_user():
+                raise ValueError('index key {field_name} is not in fields_order'.format(field_name=field_name))
+
+        self.parser_class = parser_class
+        self.key = key
+        self.policy = policy
+        self.offsets = {}
+        self.duplicates = {}
+        self.file_path = None
+        self.csv_reader = csv.reader
+        self.reader_kwargs = {}
+        self.encoding = None
+
+    def bind(self, file_path, csv_reader, reader_kwargs, encoding=None):
+        """
+        Binds index to parsed file. With encoding offsets are byte offsets and rows are read in binary mode
+        and decoded, without it they are positions returned by tell() of text file.
+        """
+        self.file_path = file_path
+        self.csv_reader = csv_reader
+        self.reader_kwargs = reader_kwargs
+        self.encoding = encoding
+
+    def get_key(self, instance):
+        if len(self.key_fields) == 1:
+            return getattr(instance, self.key_fields[0])
+
+        return tuple(getattr(instance, field_name) for field_name in self.key_fields)
+
+    def add(self, instance, offset, line_num):
+        key = self.get_key(instance)
+
+        if key not in self.offsets:
+            self.offsets[key] = offset
+            return
+
+        if self.policy == 'error':
+            raise DuplicateKeyError('duplicated key {key} in line {line_num}'.format(key=key, line_num=line_num))
+
+        self.duplicates[key] = self.duplicates.get(key, 0) + 1
+        if self.policy == 'last':
+            self.offsets[key] = offset
+
+    def get(self, key, default=None):
+        """Returns offset of row with given key"""
+        return self.offsets.get(key, default)
+
+    def keys(self):
+        return self.offsets.keys()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __contains__(self, key):
+        return key in self.offsets
+
+    def fetch(self, key):
+        """Reads and returns single row with given key"""
+        offset = self.offsets[key]
+        with self.open_file() as file:
+            return self.read_row(file, offset)
+
+    def rows(self):
+        """Yields deduplicated rows in file order"""
+        with self.open_file() as file:
+            for offset in sorted(self.offsets.values()):
+                yield self.read_row(file, offset)
+
+    def open_file(self):
+        if self.file_path is None:
+            raise RuntimeError('Index is not bound to file, it has to be built by parse_file')
+
+        if self.encoding is not None:
+            return open(self.file_path, 'rb')
+        return open(self.file_path, 'r')
+
+    def read_row(self, file, offset):
+        file.seek(offset)
+        row = next(self.csv_reader(OffsetTrackingFile(file, self.encoding), **self.reader_kwargs))
+        return self.parser_class.create_instance(row)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import csv
+import datetime
+import itertools
+import keyword
+import random
+import re
+
+from . import fields
+
+NULL_SYMBOLS = ('', '--', '-', 'N/A', 'n/a', 'NA', 'null', 'NULL', 'None', 'none', 'nan', 'NaN')
+DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%d-%m-%Y', '%d/%m/%Y', '%m/%d/%Y', '%d.%m.%Y',
+                '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M', '%d/%m/%Y %H:%M:%S')
+INTEGER_RE = re.compile(r'^[+-]?\d+$')
+DECIMAL_RE = re.compile(r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$')
+LEADING_ZERO_RE = re.compile(r'^[+-]?0\d')
+LOW_CARDINALITY_MAX_VALUES = 20
+
+
+class ColumnSchema(object):
+    def __init__(self, name, field_class, date_format=None, null_symbols=None, distinct_values=None,
+                 low_cardinality=False):
+        self.name = name
+        self.field_class = field_class
+        self.date_format = date_format
+        self.null_symbols = null_symbols
+        self.distinct_values = distinct_values
+        self.low_cardinality = low_cardinality
+
+    def create_field(self):
+        kwargs = {}
+        if self.null_symbols:
+            kwargs['null_symbols'] = list(self.null_symbols)
+        if self.field_class is fields.DateField:
+            return fields.DateField(self.date_format, **kwargs)
+        return self.field_class(**kwargs)
+
+    def source(self):
+        arguments = []
+        if self.field_class is fields.DateField:
+            arguments.append(repr(str(self.date_format)))
+        if self.null_symbols:
+            arguments.append('null_symbols={null_symbols!r}'.format(null_symbols=[str(symbol)
+                                                                                for symbol in self.null_symbols]))
+
+        line = '{name} = fields.{field_class}({arguments})'.format(
+            name=self.name, field_class=self.field_class.__name__, arguments=', '.join(arguments))
+        if self.low_cardinality:
+            line += '  # low cardinality: {count} distinct values in sample'.format(count=self.distinct_values)
+        return line
+
+
+class InferredSchema(object):
+    """
+    Columns detected by infer_schema. create_parser returns parser class, source returns its source code.
+    If file has header, start_from_line of parser class is 2, so header is skipped.
+    """
+    def __init__(self, columns, has_header, sampled_rows):
+        self.columns = columns
+        self.has_header = has_header
+        self.start_from_line = 2 if has_header else 1
+        self.sampled_rows = sampled_rows
+
+    def create_parser(self, base_class, class_name='InferredParser'):
+        attrs = dict((column.name, column.create_field()) for column in self.columns)
+        attrs['fields_order'] = [column.name for column in self.columns]
+        if self.has_header:
+            attrs['start_from_line'] = self.start_from_line
+        return type(str(class_name), (base_class,), attrs)
+
+    def source(self, class_name='InferredParser'):
+        lines = [
+            'from csvparser import parser',
+            'from csvparser import fields',
+            '',
+            '',
+            'class {class_name}(parser.Parser):'.format(class_name=class_name),
+        ]
+        lines.extend('    ' + column.source() for column in self.columns)
+        lines.append('')
+        lines.append('    fields_order = [')
+        lines.extend("        '{name}',".format(name=column.name) for column in self.columns)
+        lines.append('    ]')
+        if self.has_header:
+            lines.append('    start_from_line = {start_from_line}'.format(start_from_line=self.start_from_line))
+        return '\n'.join(lines) + '\n'
+
+
+def infer_schema(file_path, sample_rows=1000, reservoir_rows=None, has_header=None, csv_reader=csv.reader,
+                 base_class=None, **kwargs):
+    """
+    Detects field types, date formats, null symbols and low cardinality columns from sample of file.
+    Sample is first sample_rows rows or, when reservoir_rows is given, random sample_rows rows
+    of first reservoir_rows rows. Rest of file is never read.
+    """
+    with open(file_path, 'r') as file:
+        reader = csv_reader(file, **kwargs)
+        first_rows = list(itertools.islice(reader, 20))
+        if has_header is None:
+            has_header = detect_header(first_rows)
+
+        header = first_rows[0] if has_header and first_rows else None
+        rows = itertools.chain(first_rows[1:] if has_header else first_rows, reader)
+        if reservoir_rows is None:
+            sample = list(itertools.islice(rows, sample_rows))
+        else:
+            sample = reservoir_sample(itertools.islice(rows, reservoir_rows), sample_rows)
+
+    columns_count = max([len(row) for row in sample] + [len(header or [])])
+    names = create_names(header, columns_count, base_class)
+    values = [[row[i] for row in sample if i < len(row)] for i in range(columns_count)]
+    columns = [infer_column(name, column_values) for name, column_values in zip(names, values)]
+
+    return InferredSchema(columns, has_header, len(sample))
+
+
+def reservoir_sample(rows, size):
+    sample = []
+    for i, row in enumerate(rows):
+        if i < size:
+            sample.append(row)
+        else:
+            j = random.randint(0, i)
+            if j < size:
+                sample[j] = row
+    return sample
+
+
+def detect_header(first_rows):
+    """Header is assumed when first row has no numbers and no dates, but column below has them"""
+    if len(first_rows) < 2:
+        return False
+
+    header = first_rows[0]
+    if any(detect_type([value])[0] is not fields.CharField for value in header if value):
+        return False
+
+    for i in range(len(header)):
+        column_values = [row[i] for row in first_rows[1:] if i < len(row) and row[i] not in NULL_SYMBOLS]
+        if column_values and detect_type(column_values)[0] is not fields.CharField:
+            return True
+
+    # only text columns, header names have to look like names and must not repeat below
+    if len(set(header)) != len(header) or not all(re.match(r'^[^\d\W]', value, re.UNICODE) for value in header):
+        return False
+
+    return not any(i < len(row) and row[i] == value for row in first_rows[1:] for i, value in enumerate(header))
+
+
+def create_names(header, columns_count, base_class=None):
+    """Creates python identifiers from header, which do not collide with attributes of parser class"""
+    if base_class is None:
+        from .parser import Parser as base_class
+
+    reserved = set(dir(base_class))
+    names = []
+
+    for i in range(columns_count):
+        name = header[i] if header and i < len(header) else ''
+        name = re.sub(r'\W+', '_', name.strip().lower(), flags=re.UNICODE).strip('_')
+        if not name:
+            name = 'column_{number}'.format(number=i + 1)
+        if name[0].isdigit():
+            name = 'column_' + name
+        while keyword.iskeyword(name) or name in reserved or name.startswith('_') or name in names:
+            name += '_'
+        names.append(name)
+
+    return names
+
+
+def detect_type(values):
+    """Returns cheapest field class (and date format) which can represent all values"""
+    # leading zeros (e.g. identifiers) would be lost by number
+    if not any(LEADING_ZERO_RE.match(value) for value in values):
+        if all(INTEGER_RE.match(value) for value in values):
+            return fields.IntegerField, None
+
+        if all(DECIMAL_RE.match(value) for value in values):
+            return fields.DecimalField, None
+
+    for date_format in DATE_FORMATS:
+        if all(is_date(value, date_format) for value in values):
+            return fields.DateField, date_format
+
+    return fields.CharField, None
+
+
+def is_date(value, date_format):
+    try:
+        datetime.datetime.strptime(value, date_format)
+    except ValueError:
+        return False
+    return True
+
+
+def infer_column(name, values):
+    null_symbols = [symbol for symbol in NULL_SYMBOLS if symbol in set(values)]
+    not_null_values = [value for value in values if value not in null_symbols]
+
+    if not_null_values:
+        field_class, date_format = detect_type(not_null_values)
+    else:
+        field_class, date_format = fields.CharField, None
+
+    if field_class is fields.CharField and not_null_values:
+        # in text columns null symbols can be real values
+        null_symbols = []
+        not_null_values = values
+
+    distinct_values = len(set(not_null_values))
+    low_cardinality = (field_class is fields.CharField and 0 < distinct_values <= LOW_CARDINALITY_MAX_VALUES
+                       and distinct_values * 2 < len(not_null_values))
+
+    return ColumnSchema(name, field_class, date_format, null_symbols, distinct_values, low_cardinality)
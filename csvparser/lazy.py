@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import csv
+
+from .fields import ParserField
+from .plan import create_row_subclass
+
+
+def get_dialect_attribute(reader_kwargs, name):
+    dialect = reader_kwargs.get('dialect', 'excel')
+    if not isinstance(dialect, csv.Dialect) and not isinstance(dialect, type):
+        dialect = csv.get_dialect(dialect)
+    return reader_kwargs.get(name, getattr(dialect, name))
+
+
+def can_split_records(csv_reader, reader_kwargs):
+    """
+    Returns True when records without quotechar can be split on delimiter instead of tokenizing them
+    with csv reader, i.e. csv reader is csv.reader and dialect does not change meaning of other characters
+    """
+    return (csv_reader is csv.reader and len(get_dialect_attribute(reader_kwargs, 'delimiter')) == 1
+            and get_dialect_attribute(reader_kwargs, 'quoting') != csv.QUOTE_NONNUMERIC
+            and not get_dialect_attribute(reader_kwargs, 'escapechar')
+            and not get_dialect_attribute(reader_kwargs, 'skipinitialspace'))
+
+
+def get_quotechar(reader_kwargs):
+    """Returns quotechar used by csv reader with given kwargs or None when quoting is disabled"""
+    dialect = reader_kwargs.get('dialect', 'excel')
+    if not isinstance(dialect, csv.Dialect) and not isinstance(dialect, type):
+        dialect = csv.get_dialect(dialect)
+
+    if reader_kwargs.get('quoting', dialect.quoting) == csv.QUOTE_NONE:
+        return None
+
+    return reader_kwargs.get('quotechar', dialect.quotechar)
+
+
+def iter_raw_records(lines, quotechar='"'):
+    """
+    Groups lines into raw records without tokenizing them. Lines are joined while record has
+    odd number of quotechars, so newlines inside quoted values do not end record.
+    Lines and quotechar can be both str or both bytes.
+    """
+    pending_lines = None
+    quotes = 0
+
+    for line in lines:
+        if pending_lines is None:
+            if not quotechar or quotechar not in line:
+                yield line
+                continue
+
+            quotes = line.count(quotechar)
+            if quotes % 2 == 0:
+                yield line
+                continue
+
+            pending_lines = [line]
+        else:
+            pending_lines.append(line)
+            quotes += line.count(quotechar)
+            if quotes % 2 == 0:
+                yield pending_lines[0][:0].join(pending_lines)
+                pending_lines = None
+
+    if pending_lines is not None:
+        yield pending_lines[0][:0].join(pending_lines)
+
+
+class RawValueLoader(object):
+    """
+    Non-data descriptor placed on lazy row class under name of raw value of field. Instance attribute takes
+    precedence over it, so it is used only until raw record is split, then raw values are read directly.
+    """
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, cls):
+        if instance is None:
+            return self
+        if '_raw_record' not in instance.__dict__:
+            raise AttributeError(self.name)
+
+        instance.load_raw_record()
+        return instance.__dict__[self.name]
+
+
+def create_lazy_class(plan):
+    """Returns subclass of parser class for rows parsed with lazy=True, raw values are loaded by RawValueLoader"""
+    descriptors = dict((field.name, RawValueLoader(field.name)) for field in plan.fields
+                       if isinstance(field, ParserField))
+    return create_row_subclass(plan, (create_lazy_class,), descriptors)
+
+
+class RecordFeed(object):
+    """Iterator returning raw record put into it once, so one csv reader can be reused for many records"""
+    def __init__(self):
+        self.raw_record = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        raw_record = self.raw_record
+        if raw_record is None:
+            raise StopIteration
+        self.raw_record = None
+        return raw_record
+
+    next = __next__
+
+
+class RecordTokenizer(object):
+    """
+    Splits single raw record into cells, shared by all lazy rows of one parse. Records without quotechar
+    are split on delimiter when csv reader allows it (see can_split_records), others are tokenized
+    by one csv reader reading from RecordFeed.
+    """
+    def __init__(self, csv_reader, reader_kwargs, plan):
+        self.csv_reader = csv_reader
+        self.reader_kwargs = reader_kwargs
+        self.plan = plan
+        self.row_class = plan.get_row_class(create_lazy_class)
+        self.quotechar = get_quotechar(reader_kwargs)
+        self.delimiter = get_dialect_attribute(reader_kwargs, 'delimiter')
+        self.can_split = can_split_records(csv_reader, reader_kwargs)
+        self.feed = RecordFeed()
+        self.reader = csv_reader(self.feed, **reader_kwargs)
+
+    def __call__(self, raw_record):
+        if self.can_split and (self.quotechar is None or self.quotechar not in raw_record):
+            raw_record = raw_record.rstrip('\r\n')
+            if not raw_record:
+                return []
+            return raw_record.split(self.delimiter)
+
+        self.feed.raw_record = raw_record
+        return next(self.reader, [])
+
+    def __reduce__(self):
+        # csv reader can not be pickled, it is created again
+        return RecordTokenizer, (self.csv_reader, self.reader_kwargs, self.plan)
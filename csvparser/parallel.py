@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import csv
+import glob
+import io
+import multiprocessing
+import os
+
+from . import plan
+
+class FileStats(object):
+    def __init__(self):
+        self.rows = 0
+        self.invalid_rows = 0
+        self.errors = {}
+        self.failures = []
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.invalid_rows += other.invalid_rows
+        for error, count in other.errors.items():
+            self.errors[error] = self.errors.get(error, 0) + count
+        self.failures.extend(other.failures)
+
+    def add_error(self, error):
+        self.errors[error] = self.errors.get(error, 0) + 1
+
+    def discard_row(self, errors):
+        """Removes row counted by worker, which turned out to be before start_from_line"""
+        self.rows -= 1
+        if errors:
+            self.invalid_rows -= 1
+            for error in errors:
+                self.errors[error] -= 1
+                if not self.errors[error]:
+                    del self.errors[error]
+
+
+class ParseStats(object):
+    """Statistics of parse_many, per file (self.files) and merged (self.total)"""
+    def __init__(self):
+        self.files = {}
+
+    def merge(self, file_path, file_stats):
+        self.files.setdefault(file_path, FileStats()).merge(file_stats)
+
+    @property
+    def total(self):
+        total = FileStats()
+        for file_stats in self.files.values():
+            total.merge(file_stats)
+        return total
+
+
+def find_paths(paths_or_glob):
+    if isinstance(paths_or_glob, type('')):
+        return sorted(glob.glob(paths_or_glob))
+    return list(paths_or_glob)
+
+
+def split_file(file_path, file_size, split_size):
+    """
+    Splits file into chunks of about split_size bytes ending at line ends, returns list of (start, end).
+    Only ends of chunks are read here, lines are counted by workers (see parse_task). Chunks end at newlines,
+    so files with newlines inside quoted values must not be split.
+    """
+    if split_size is None or file_size <= split_size:
+        return [(0, file_size)]
+
+    chunks = []
+    start = 0
+
+    with open(file_path, 'rb') as file:
+        while start < file_size:
+            end = start + split_size
+            if end >= file_size:
+                end = file_size
+            else:
+                file.seek(end)
+                end += len(file.readline())
+
+            chunks.append((start, end))
+            start = end
+
+    return chunks
+
+
+def parse_task(task):
+    """
+    Runs in worker process. Tokenizes chunk of file and optionally validates rows,
+    returns raw rows with their errors (None when rows are not validated), which are cheaper
+    to send between processes than parser instances. Line numbers of rows and failures are relative
+    to first line of chunk, parent adds first line to them when it gets number of lines of previous chunks.
+    """
+    parser_class, file_path, chunk_index, start, end, skipped_lines, csv_reader, reader_kwargs, encoding, \
+        validate = task
+    parser_plan = parser_class.get_plan(refresh=True)
+    fields_count = len(parser_plan.field_names)
+    stats = FileStats()
+    failures = []
+    rows = []
+    lines = 0
+
+    try:
+        with open(file_path, 'rb') as file:
+            file.seek(start)
+            data = file.read(end - start)
+
+        lines = data.count(b'\n')
+        reader = csv_reader(io.StringIO(data.decode(encoding), newline=''), **reader_kwargs)
+        for line_offset, row in enumerate(reader):
+            if line_offset < skipped_lines:
+                continue
+
+            if len(row) < fields_count:
+                failures.append((line_offset, 'row has {row_length} values, but parser has {fields_count} '
+                                              'fields'.format(row_length=len(row), fields_count=fields_count)))
+                continue
+
+            errors = None
+            if validate:
+                instance = parser_plan.create_instance(row)
+                try:
+                    row_is_valid = instance.is_valid()
+                    errors = instance.errors
+                except (ValueError, ArithmeticError, TypeError) as e:
+                    row_is_valid = False
+                    errors = [type(e).__name__]
+
+                if not row_is_valid:
+                    stats.invalid_rows += 1
+                    for error in errors:
+                        stats.add_error(error)
+
+            stats.rows += 1
+            rows.append((line_offset, row, errors))
+    except (csv.Error, UnicodeDecodeError, IOError, OSError) as e:
+        failures.append((None, '{error_type}: {error}'.format(error_type=type(e).__name__, error=e)))
+
+    return file_path, chunk_index, lines, rows, failures, stats
+
+
+def load_worker_plans(data):
+    try:
+        plan.load_plans(data)
+    except (ImportError, AttributeError, ValueError):
+        # plans are only optimization, worker compiles them itself
+        pass
+
+
+class ParseManyResult(object):
+    """
+    Iterates over (file path, line number, parser instance) of all files. Files are parsed by pool
+    of worker processes, largest chunks first, so big files do not stall at the end. Rows of different
+    files are yielded in order of completion, chunks of one file in file order. Statistics are merged
+    into self.stats. With validate=True rows are validated by workers and yielded with errors set
+    (empty list for valid rows). Files are split into chunks only when split_size is given.
+    """
+    def __init__(self, parser_class, paths_or_glob, workers=None, start_from_line=1, csv_reader=csv.reader,
+                 split_size=None, validate=False, encoding='utf-8', **kwargs):
+        self.parser_class = parser_class
+        self.paths = find_paths(paths_or_glob)
+        self.workers = workers or multiprocessing.cpu_count()
+        self.start_from_line = start_from_line
+        self.csv_reader = csv_reader
+        self.split_size = split_size
+        self.validate = validate
+        self.encoding = encoding
+        self.reader_kwargs = kwargs
+        self.stats = ParseStats()
+
+    def create_tasks(self):
+        tasks = []
+        for file_path in self.paths:
+            file_size = os.path.getsize(file_path)
+            for chunk_index, (start, end) in enumerate(split_file(file_path, file_size, self.split_size)):
+                # only worker of first chunk knows which lines are before start_from_line
+                skipped_lines = self.start_from_line - 1 if chunk_index == 0 else 0
+                tasks.append((end - start, (self.parser_class, file_path, chunk_index, start, end, skipped_lines,
+                                            self.csv_reader, self.reader_kwargs, self.encoding, self.validate)))
+
+        tasks.sort(key=lambda task: task[0], reverse=True)
+        return [task for size, task in tasks]
+
+    def __iter__(self):
+        parser_plan = self.parser_class.get_plan(refresh=True)
+        tasks = self.create_tasks()
+
+        if self.workers == 1:
+            for first_line, result in self.order_chunks(map(parse_task, tasks)):
+                for item in self.process_result(parser_plan, first_line, result):
+                    yield item
+            return
+
+        pool = multiprocessing.Pool(self.workers, initializer=load_worker_plans,
+                                    initargs=(plan.dump_plans([self.parser_class]),))
+        try:
+            # chunksize=1, idle worker takes next task as soon as it finishes previous one
+            results = pool.imap_unordered(parse_task, tasks, chunksize=1)
+            for first_line, result in self.order_chunks(results):
+                for item in self.process_result(parser_plan, first_line, result):
+                    yield item
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+    @staticmethod
+    def order_chunks(results):
+        """
+        Yields (first line, result) of chunks of each file in file order, results of chunks which finished
+        before previous chunks of the same file are kept until first line of chunk is known
+        """
+        next_chunks = {}
+        finished = {}
+
+        for result in results:
+            file_path, chunk_index = result[:2]
+            finished[file_path, chunk_index] = result
+            next_chunk, first_line = next_chunks.get(file_path, (0, 1))
+
+            while (file_path, next_chunk) in finished:
+                result = finished.pop((file_path, next_chunk))
+                yield first_line, result
+                first_line += result[2]
+                next_chunk += 1
+
+            next_chunks[file_path] = next_chunk, first_line
+
+    def process_result(self, parser_plan, first_line, result):
+        file_path, chunk_index, lines, rows, failures, stats = result
+
+        if chunk_index > 0 and first_line < self.start_from_line:
+            # lines before start_from_line are skipped by worker only in first chunk, other chunks are fixed here
+            kept_rows = []
+            for row in rows:
+                if first_line + row[0] < self.start_from_line:
+                    stats.discard_row(row[2])
+                else:
+                    kept_rows.append(row)
+            rows = kept_rows
+
+        for line_offset, message in failures:
+            if line_offset is None:
+                stats.failures.append(message)
+            elif first_line + line_offset >= self.start_from_line:
+                stats.failures.append('line {line_num}: {message}'.format(line_num=first_line + line_offset,
+                                                                          message=message))
+        self.stats.merge(file_path, stats)
+
+        for line_offset, row, errors in rows:
+            instance = parser_plan.create_instance(row)
+            instance.errors = errors
+            yield file_path, first_line + line_offset, instance
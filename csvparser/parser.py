@@ -3,34 +3,216 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 
 import csv
 
+from . import writers
+from .index import KeyIndex, OffsetTrackingFile
+from .follow import FileFollower
+from .lazy import iter_raw_records, get_quotechar, RecordTokenizer
+from .binary import BytesTokenizer, create_binary_class
+from .fields import ParserField
+from .plan import ParserPlan
+from .parallel import ParseManyResult
+from .inference import infer_schema
+
 
 class Parser(object):
     fields_order = []
+    start_from_line = 1
+    index_key = None
+    index_policy = 'first'
+    validation_order = 'declared'
 
     def __init__(self):
         self.errors = None
 
     @classmethod
-    def parse_file(cls, file_path, start_from_line=1, csv_reader=csv.reader, **kwargs):
-        return cls.parse_file_object(open(file_path, 'r'), start_from_line, csv_reader, **kwargs)
+    def parse_file(cls, file_path, start_from_line=None, csv_reader=csv.reader, index=None, lazy=False, cache=None,
+                   binary=False, encoding=None, **kwargs):
+        """
+        Yields parser instances, see parse_file_object. Encoding is used to open file in text mode,
+        in binary mode it defaults to utf-8.
+        """
+        if start_from_line is None:
+            start_from_line = cls.start_from_line
+
+        if cache is not None:
+            if index is not None or lazy or binary:
+                raise ValueError('cache can not be used with index, lazy or binary')
+            if encoding is not None:
+                # passed through cache, so it is part of cache key
+                kwargs['encoding'] = encoding
+            return cache.parse_file(cls, file_path, start_from_line, csv_reader, **kwargs)
+
+        if binary:
+            if lazy:
+                raise ValueError('lazy can not be used with binary')
+            return cls.parse_file_object(open(file_path, 'rb'), start_from_line, csv_reader, index, lazy, binary,
+                                         encoding or 'utf-8', **kwargs)
+
+        return cls.parse_file_object(open(file_path, 'r', encoding=encoding), start_from_line, csv_reader, index,
+                                     lazy, **kwargs)
 
     @classmethod
-    def parse_file_object(cls, file_object, start_from_line=1, csv_reader=csv.reader, **kwargs):
-        cls.check_if_fields_order_contains_proper_names()
+    def parse_file_object(cls, file_object, start_from_line=None, csv_reader=csv.reader, index=None, lazy=False,
+                          binary=False, encoding='utf-8', **kwargs):
+        """
+        Yields parser instances. With lazy=True rows keep only raw record,
+        which is split into cells on first access to any field.
+        With binary=True file object has to be opened in binary mode. Rows keep bytes cells,
+        IntegerField and DecimalField convert them directly, other fields decode them with encoding on access.
+        Without start_from_line rows are parsed from cls.start_from_line.
+        """
+        if start_from_line is None:
+            start_from_line = cls.start_from_line
+        if binary and lazy:
+            raise ValueError('lazy can not be used with binary')
+
+        plan = cls.get_plan(refresh=True)
 
         with file_object as file:
-            reader = csv_reader(file, **kwargs)
-            fields = cls.get_all_field_names_declared_by_user()
+            if index is not None:
+                file = OffsetTrackingFile(file)
+                if binary:
+                    offsets_encoding = encoding
+                elif file.byte_offsets:
+                    offsets_encoding = file.encoding
+                else:
+                    offsets_encoding = None
+                index.bind(getattr(file.file, 'name', None), csv_reader, kwargs, offsets_encoding)
+
+            if lazy:
+                reader = iter_raw_records(file, get_quotechar(kwargs))
+                tokenizer = RecordTokenizer(csv_reader, kwargs, plan)
+                lazy_class = tokenizer.row_class
+            elif binary:
+                tokenizer = BytesTokenizer(csv_reader, kwargs, encoding)
+                binary_class = plan.get_row_class(create_binary_class, encoding)
+                reader = map(tokenizer, iter_raw_records(file, tokenizer.quotechar))
+            else:
+                reader = csv_reader(file, **kwargs)
 
             for skipped_row in range(1, start_from_line):
                 next(reader)
 
+            if index is not None:
+                offset = file.tell()
+
             for line_num, row in enumerate(reader, start=start_from_line):
-                instance = cls()
-                for i, field in enumerate(fields):
-                    setattr(instance, field, row[i])
+                if lazy:
+                    instance = lazy_class()
+                    instance._raw_record = (row, tokenizer)
+                elif binary:
+                    instance = plan.create_instance(row, binary_class)
+                else:
+                    instance = plan.create_instance(row)
+
+                if index is not None:
+                    index.add(instance, offset, line_num)
+                    offset = file.tell()
+
                 yield instance
 
+    @classmethod
+    def parse_many(cls, paths_or_glob, workers=None, start_from_line=None, csv_reader=csv.reader, **kwargs):
+        """
+        Parses many files using pool of processes, returns iterator over (file path, line number, instance),
+        see ParseManyResult
+        """
+        if start_from_line is None:
+            start_from_line = cls.start_from_line
+        return ParseManyResult(cls, paths_or_glob, workers, start_from_line, csv_reader, **kwargs)
+
+    @classmethod
+    def infer(cls, file_path, sample_rows=1000, class_name='InferredParser', **kwargs):
+        """
+        Returns parser class with fields detected from sample of file, see infer_schema. Its start_from_line
+        is 2 when file has header.
+        Use inference.infer_schema(...).source() to get its source code.
+        """
+        schema = infer_schema(file_path, sample_rows, base_class=cls, **kwargs)
+        return schema.create_parser(cls, class_name)
+
+    @classmethod
+    def follow_file(cls, file_path, start_from_line=None, csv_reader=csv.reader, **kwargs):
+        """
+        Returns iterator over rows appended to file while it is being written, see FileFollower
+        """
+        if start_from_line is None:
+            start_from_line = cls.start_from_line
+        return FileFollower(cls, file_path, start_from_line, csv_reader, **kwargs)
+
+    @classmethod
+    def get_plan(cls, refresh=False):
+        """
+        Returns ParserPlan of class. It is compiled on first use and recompiled when fields_order is replaced.
+        With refresh=True it is also recompiled when fields_order was changed in place or fields were replaced,
+        this check is done once per parse call, not for every row.
+        """
+        plan = cls.__dict__.get('_parser_plan')
+        if plan is None or plan.fields_order is not cls.fields_order or (refresh and not plan.is_up_to_date()):
+            plan = ParserPlan.compile(cls)
+            cls._parser_plan = plan
+        return plan
+
+    @classmethod
+    def create_instance(cls, row):
+        return cls.get_plan(refresh=True).create_instance(row)
+
+    def load_raw_record(self):
+        """Splits raw record of lazy row into cells. Fields set after parsing are not overwritten."""
+        raw_record, tokenizer = self.__dict__.pop('_raw_record')
+        row = tokenizer(raw_record)
+        plan = tokenizer.plan
+
+        if len(row) < len(plan.field_names):
+            raise IndexError('row has {row_length} values, but parser has {fields_length} fields'.format(
+                row_length=len(row), fields_length=len(plan.field_names)))
+
+        if plan.slot_names is None:
+            for i, (field_name, field) in enumerate(zip(plan.field_names, plan.fields)):
+                if not isinstance(field, ParserField) or field.name not in self.__dict__:
+                    setattr(self, field_name, row[i])
+        else:
+            # only few attributes are set before loading, they are copied and restored over raw values
+            assigned = self.__dict__.copy()
+            self.__dict__.update(zip(plan.slot_names, row))
+            self.__dict__.update(assigned)
+
+    def __getattr__(self, name):
+        # called only when attribute is missing, e.g. raw value of field which is not ParserField
+        # in not yet tokenized lazy row, raw values of ParserFields are loaded by RawValueLoader
+        if name.startswith('__') or '_raw_record' not in self.__dict__:
+            raise AttributeError(name)
+
+        self.load_raw_record()
+        return object.__getattribute__(self, name)
+
+    @classmethod
+    def create_index(cls, key=None, policy=None):
+        """
+        Returns KeyIndex which can be passed to parse_file. Defaults are taken from index_key and index_policy.
+        """
+        if key is None:
+            key = cls.index_key
+        if key is None:
+            raise RuntimeError('You have to specify index_key or pass key')
+        if policy is None:
+            policy = cls.index_policy
+
+        return KeyIndex(cls, key, policy)
+
+    @classmethod
+    def write_file(cls, rows, file_path, csv_writer=csv.writer, write_header=False, **kwargs):
+        return cls.write_file_object(rows, open(file_path, 'w', newline=''), csv_writer, write_header, **kwargs)
+
+    @classmethod
+    def write_file_object(cls, rows, file_object, csv_writer=csv.writer, write_header=False, **kwargs):
+        """
+        Writes rows (parser instances) to csv using declared fields to serialize typed values
+        """
+        with file_object as file:
+            with writers.CsvWriter(cls, file, csv_writer=csv_writer, write_header=write_header, **kwargs) as writer:
+                writer.write_rows(rows)
+
     @classmethod
     def get_all_field_names_declared_by_user(cls):
         if not cls.fields_order:
@@ -38,16 +220,28 @@ class Parser(object):
 
         return cls.fields_order
 
-    def is_valid(self):
+    def is_valid(self, fail_fast=False):
         """
-        Validates single instance. Returns boolean value and store errors in self.errors
+        Validates single instance. Returns boolean value and store errors in self.errors.
+        With fail_fast=True validation stops at first failing validator.
+        When validation_order is 'adaptive', fields and validators which failed most often and
+        are cheapest are checked first, based on statistics of previous validations.
         """
-        self.errors = []
+        plan = self.get_plan()
+
+        if self.validation_order == 'adaptive' and plan.slot_names is not None:
+            self.errors = plan.validation_stats.validate(self, fail_fast)
+            return len(self.errors) == 0
 
-        for field in self.get_all_field_names_declared_by_user():
-            getattr(type(self), field).is_valid(self, type(self), field)
-            field_errors = getattr(type(self), field).errors(self)
-            self.errors.extend(field_errors)
+        self.errors = []
+        for field_name, field, field_accepts_fail_fast in zip(plan.field_names, plan.fields, plan.accepts_fail_fast):
+            if fail_fast and field_accepts_fail_fast:
+                field_is_valid = field.is_valid(self, type(self), field_name, fail_fast=True)
+            else:
+                field_is_valid = field.is_valid(self, type(self), field_name)
+            self.errors.extend(field.errors(self))
+            if fail_fast and not field_is_valid:
+                break
 
         return len(self.errors) == 0
 
@@ -60,5 +254,5 @@ class Parser(object):
         return True
 
     def __iter__(self):
-        for field in self.get_all_field_names_declared_by_user():
-            yield getattr(self, field)
\ No newline at end of file
+        for field_name in self.get_plan().field_names:
+            yield getattr(self, field_name)
\ No newline at end of file
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import importlib
+import time
+
+from .fields import ParserField, accepts_fail_fast
+
+
+class ParserPlan(object):
+    """
+    Per class setup needed for parsing: field names, fields and names of attributes where raw values are stored.
+    Compiled once by Parser.get_plan and cached on parser class. Plans can be pickled (see dump_plans),
+    loaded plan is bound to parser class again without repeating the checks.
+    """
+    def __init__(self, parser_class, field_names):
+        self.parser_class = parser_class
+        self.fields_order = parser_class.fields_order
+        self.field_names = tuple(field_names)
+        self.fields = tuple(getattr(parser_class, field_name) for field_name in self.field_names)
+        self.accepts_fail_fast = tuple(accepts_fail_fast(field) for field in self.fields)
+
+        if all(isinstance(field, ParserField) for field in self.fields):
+            self.slot_names = tuple(field.name for field in self.fields)
+            self.value_names = tuple(field.value_name for field in self.fields)
+        else:
+            self.slot_names = None
+            self.value_names = None
+
+        self._schema_hash = None
+        self._validation_stats = None
+        self.row_classes = {}
+        self.writer_serializers = {}
+
+    @classmethod
+    def compile(cls, parser_class):
+        field_names = parser_class.get_all_field_names_declared_by_user()
+        parser_class.check_if_fields_order_contains_proper_names()
+        return cls(parser_class, field_names)
+
+    def is_up_to_date(self):
+        """Checks that fields_order and fields of parser class did not change since plan was created"""
+        parser_class = self.parser_class
+        if tuple(parser_class.fields_order) != self.field_names:
+            return False
+
+        for field_name, field in zip(self.field_names, self.fields):
+            if getattr(parser_class, field_name, None) is not field:
+                return False
+        return True
+
+    @property
+    def schema_hash(self):
+        """Hash of field declarations, changes when fields, their order or their options change"""
+        if self._schema_hash is None:
+            # imported here, parsers which do not use cache do not pay for it at startup
+            import hashlib
+
+            schema = [describe_field(field_name, field) for field_name, field in zip(self.field_names, self.fields)]
+            self._schema_hash = hashlib.sha1(repr(schema).encode('utf-8')).hexdigest()
+
+        return self._schema_hash
+
+    @property
+    def validation_stats(self):
+        if self._validation_stats is None:
+            self._validation_stats = ValidationStats(self.field_names, self.fields)
+
+        return self._validation_stats
+
+    def create_instance(self, row, row_class=None):
+        """Creates instance of parser class or of its row class (see get_row_class) from cells of row"""
+        if len(row) < len(self.field_names):
+            raise IndexError('row has {row_length} values, but parser has {fields_length} fields'.format(
+                row_length=len(row), fields_length=len(self.field_names)))
+
+        instance = (row_class or self.parser_class)()
+
+        if self.slot_names is None:
+            for field_name, value in zip(self.field_names, row):
+                setattr(instance, field_name, value)
+        else:
+            instance.__dict__.update(zip(self.slot_names, row))
+
+        return instance
+
+    def __reduce__(self):
+        parser_class = self.parser_class
+        return load_plan, (parser_class.__module__, getattr(parser_class, '__qualname__', parser_class.__name__),
+                           self.field_names)
+
+    def get_row_class(self, create_row_class, *options):
+        """
+        Returns subclass of parser class created by create_row_class(plan, *options), cached on plan.
+        Used for rows which read fields with their own descriptors, e.g. rows parsed with binary=True
+        or loaded from ResultCache.
+        """
+        key = (create_row_class,) + options
+        row_class = self.row_classes.get(key)
+        if row_class is None:
+            row_class = self.row_classes[key] = create_row_class(self, *options)
+        return row_class
+
+
+def create_row_subclass(plan, key, descriptors, **attrs):
+    """
+    Creates subclass of parser class which replaces fields with descriptors. It shares plan with parser class,
+    so class attributes have to return declared fields. Rows are pickled as rows of parser class with key
+    of row class (see ParserPlan.get_row_class), row class is created again when they are loaded.
+    """
+    parser_class = plan.parser_class
+    attrs.update(descriptors)
+    attrs.update({
+        '__module__': parser_class.__module__,
+        '__qualname__': getattr(parser_class, '__qualname__', parser_class.__name__),
+        '__doc__': parser_class.__doc__,
+        '__reduce__': reduce_row,
+        '_parser_plan': plan,
+        '_parser_row_class_key': key,
+    })
+    return type(parser_class.__name__, (parser_class,), attrs)
+
+
+def reduce_row(instance):
+    row_class = type(instance)
+    return restore_row, (row_class._parser_plan.parser_class, row_class._parser_row_class_key,
+                         instance.__dict__.copy())
+
+
+def restore_row(parser_class, key, state):
+    row_class = parser_class.get_plan().get_row_class(*key)
+    instance = row_class.__new__(row_class)
+    instance.__dict__.update(state)
+    return instance
+
+
+class ValidationStats(object):
+    """
+    Collects failures and sampled cost of fields and failures of validators of parser class.
+    Used by Parser.is_valid when validation_order = 'adaptive', so with fail_fast cheap and most often failing
+    checks run first. Order is recomputed every reorder_every validations.
+    """
+    sample_every = 16
+    reorder_every = 256
+
+    def __init__(self, field_names, fields):
+        self.field_names = field_names
+        self.fields = fields
+        self.validations = 0
+
+        self.field_runs = [0] * len(fields)
+        self.field_failures = [0] * len(fields)
+        self.field_time = [0.0] * len(fields)
+        self.field_timed_runs = [0] * len(fields)
+        self.validator_runs = [dict((validator, 0) for validator in field.validators) for field in fields]
+        self.validator_failures = [dict((validator, 0) for validator in field.validators) for field in fields]
+
+        self.custom_is_valid = [type(field).is_valid is not ParserField.is_valid for field in fields]
+        self.accepts_fail_fast = [accepts_fail_fast(field) for field in fields]
+
+        self.field_order = list(range(len(fields)))
+        self.validator_orders = [list(field.validators) for field in fields]
+
+    def validate(self, instance, fail_fast):
+        """
+        Validates instance like Parser.is_valid, returns list of errors. Order is adapted only with fail_fast,
+        without it all checks run anyway and errors are in declared order.
+        """
+        cls = type(instance)
+        errors = []
+        self.validations += 1
+        timed = self.validations % self.sample_every == 0
+        field_order = self.field_order if fail_fast else range(len(self.fields))
+
+        for i in field_order:
+            field = self.fields[i]
+            field_name = self.field_names[i]
+            validators = self.validator_orders[i] if fail_fast else field.validators
+
+            if timed:
+                start = time.perf_counter()
+
+            if self.custom_is_valid[i]:
+                # field overrides is_valid, it is run as whole and its validators are not counted
+                if fail_fast and self.accepts_fail_fast[i]:
+                    field_is_valid = field.is_valid(instance, cls, field_name, fail_fast=True)
+                else:
+                    field_is_valid = field.is_valid(instance, cls, field_name)
+                field_errors = field.errors(instance)
+                failed_validators = []
+            else:
+                field_errors = []
+                setattr(instance, field.errors_field_name, field_errors)
+                value = getattr(instance, field_name)
+                failed_validators = field.run_validators(value, field_name, validators, fail_fast, field_errors)
+                field_is_valid = not failed_validators
+
+            if timed:
+                self.field_time[i] += time.perf_counter() - start
+                self.field_timed_runs[i] += 1
+
+            self.field_runs[i] += 1
+            if not self.custom_is_valid[i]:
+                validator_runs = self.validator_runs[i]
+                if fail_fast and failed_validators:
+                    runs = validators.index(failed_validators[-1]) + 1
+                else:
+                    runs = len(validators)
+                for validator in validators[:runs]:
+                    validator_runs[validator] += 1
+
+            if not field_is_valid:
+                self.field_failures[i] += 1
+                for validator in failed_validators:
+                    self.validator_failures[i][validator] += 1
+                errors.extend(field_errors)
+                if fail_fast:
+                    break
+
+        if self.validations % self.reorder_every == 0:
+            self.reorder()
+
+        return errors
+
+    @staticmethod
+    def failure_rate(failures, runs):
+        # smoothed, so checks which did not run yet are not ordered first or last
+        return (failures + 1.0) / (runs + 2.0)
+
+    def reorder(self):
+        average_time = [self.field_time[i] / self.field_timed_runs[i] if self.field_timed_runs[i] else None
+                        for i in range(len(self.fields))]
+        known_times = [field_time for field_time in average_time if field_time]
+        default_time = sum(known_times) / len(known_times) if known_times else 1.0
+
+        def field_score(i):
+            return self.failure_rate(self.field_failures[i], self.field_runs[i]) / (average_time[i] or default_time)
+
+        self.field_order = sorted(range(len(self.fields)), key=field_score, reverse=True)
+
+        for i, field in enumerate(self.fields):
+            failures = self.validator_failures[i]
+            runs = self.validator_runs[i]
+            self.validator_orders[i] = sorted(
+                field.validators, key=lambda validator: self.failure_rate(failures[validator], runs[validator]),
+                reverse=True)
+
+
+def describe_field(field_name, field):
+    options = {}
+    for name, value in sorted(vars(field).items()):
+        if name in ('name', 'errors_field_name', 'value_name', 'init_done') or name.startswith('_'):
+            continue
+        if name == 'validators':
+            value = [(type(validator).__name__, describe_validator(validator)) for validator in value]
+        options[name] = value
+
+    return field_name, type(field).__module__, type(field).__name__, sorted(options.items())
+
+
+def describe_validator(validator):
+    return sorted((name, describe_value(value)) for name, value in vars(validator).items() if name != 'errors')
+
+
+def describe_value(value):
+    # repr of functions contains their address, which differs between processes
+    if callable(value) and hasattr(value, '__name__'):
+        return getattr(value, '__module__', None), getattr(value, '__qualname__', value.__name__)
+
+    return repr(value)
+
+
+def load_plan(module_name, class_name, field_names):
+    """
+    Binds pickled plan to parser class and caches it on the class. Schema hash is not taken from dumping
+    process, it is computed from fields of this process when it is needed.
+    """
+    parser_class = importlib.import_module(module_name)
+    for name in class_name.split('.'):
+        parser_class = getattr(parser_class, name)
+
+    plan = parser_class.__dict__.get('_parser_plan')
+    if plan is not None and plan.is_up_to_date():
+        return plan
+
+    if tuple(parser_class.fields_order) != tuple(field_names):
+        raise ValueError('Loaded plan does not match fields_order of {class_name}'.format(class_name=class_name))
+
+    plan = ParserPlan(parser_class, field_names)
+    parser_class._parser_plan = plan
+    return plan
+
+
+def dump_plans(parser_classes):
+    """
+    Returns bytes with compiled plans of parser classes, load them in worker processes with load_plans.
+    Plans are stored as text lines instead of pickle, so loading them does not import pickle at startup.
+    """
+    lines = []
+    for parser_class in parser_classes:
+        module_name, class_name, field_names = parser_class.get_plan(refresh=True).__reduce__()[1]
+        lines.append('\t'.join([module_name, class_name, ','.join(field_names)]))
+
+    return '\n'.join(lines).encode('utf-8')
+
+
+def load_plans(data):
+    plans = []
+    for line in data.decode('utf-8').splitlines():
+        module_name, class_name, field_names = line.split('\t')
+        plans.append(load_plan(module_name, class_name, field_names.split(',')))
+
+    return plans
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+from .columns import ColumnsBuilder, ColumnsReader
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    resource_tracker = shared_memory = None
+
+ALIGNMENT = 8
+
+
+def open_segment(name=None, size=0):
+    if shared_memory is None:
+        raise RuntimeError('Shared batches require multiprocessing.shared_memory (python 3.8+)')
+
+    create = name is None
+    try:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    except TypeError:
+        # before python 3.13 segments are always tracked and unlinked when process which opened them exits,
+        # but lifetime of batches is controlled by consumers
+        segment = shared_memory.SharedMemory(name=name, create=create, size=size)
+        resource_tracker.unregister(segment._name, 'shared_memory')
+        return segment
+
+
+def unlink_segment(segment):
+    if not hasattr(segment, '_track'):
+        # unlink before python 3.13 unregisters segment from resource tracker, which does not know it
+        resource_tracker.register(segment._name, 'shared_memory')
+
+    try:
+        segment.unlink()
+    except (IOError, OSError):
+        pass
+
+
+def publish(parser_class, rows, consumers=1):
+    """
+    Stores real values of rows as columns in new shared memory segment. Returns one SharedBatchDescriptor
+    per consumer, each consumer has to attach its descriptor and release batch. Segment is removed
+    when all consumers released it.
+    """
+    if consumers < 1:
+        raise ValueError('consumers has to be at least 1, otherwise nobody releases the batch')
+
+    builder = ColumnsBuilder(parser_class.get_plan(refresh=True))
+    for row in rows:
+        builder.append(row)
+    layout, data = builder.encode()
+
+    # segment starts with one byte per consumer, set when consumer released batch
+    data_offset = consumers + (-consumers % ALIGNMENT)
+    segment = open_segment(size=data_offset + max(len(data), 1))
+    try:
+        segment.buf[:data_offset] = bytes(data_offset)
+        segment.buf[data_offset:data_offset + len(data)] = data
+    finally:
+        segment.close()
+
+    return [SharedBatchDescriptor(segment.name, parser_class, layout, builder.row_count, data_offset, len(data),
+                                  consumers, consumer_index)
+            for consumer_index in range(consumers)]
+
+
+class SharedBatchDescriptor(object):
+    """Small picklable description of published batch, send it to consumer through queue or pipe"""
+    def __init__(self, name, parser_class, layout, row_count, data_offset, data_length, consumers, consumer_index):
+        self.name = name
+        self.parser_class = parser_class
+        self.layout = layout
+        self.row_count = row_count
+        self.data_offset = data_offset
+        self.data_length = data_length
+        self.consumers = consumers
+        self.consumer_index = consumer_index
+
+    def attach(self):
+        return SharedBatch(self)
+
+
+class SharedBatch(object):
+    """
+    Rows of published batch read from shared memory without copying. Rows give access to values
+    by field names declared on parser class, columns can be read at once by column(field_name).
+    """
+    def __init__(self, descriptor):
+        self.descriptor = descriptor
+        self.plan = descriptor.parser_class.get_plan(refresh=True)
+        self.segment = open_segment(descriptor.name)
+        data = self.segment.buf[descriptor.data_offset:descriptor.data_offset + descriptor.data_length]
+        self.reader = ColumnsReader(data, descriptor.layout, descriptor.row_count)
+        self.raw_fields = dict((i, field) for i, (field, column) in enumerate(zip(self.plan.fields, descriptor.layout))
+                               if column['kind'] == 'raw')
+
+    def __len__(self):
+        return self.descriptor.row_count
+
+    def __getitem__(self, row_index):
+        if not 0 <= row_index < len(self):
+            raise IndexError('row index out of range')
+        return SharedRow(self, row_index)
+
+    def __iter__(self):
+        for row_index in range(len(self)):
+            yield SharedRow(self, row_index)
+
+    def value(self, column_index, row_index):
+        value = self.reader.value(column_index, row_index)
+        if column_index in self.raw_fields:
+            value = self.convert_raw_value(self.raw_fields[column_index], value)
+        return value
+
+    def column(self, field_name):
+        column_index = self.reader.positions[field_name]
+        values = self.reader.column(column_index)
+        if column_index in self.raw_fields:
+            field = self.raw_fields[column_index]
+            values = [self.convert_raw_value(field, value) for value in values]
+        return values
+
+    @staticmethod
+    def convert_raw_value(field, raw_value):
+        if field.null_symbols is not None and raw_value in field.null_symbols:
+            return None
+        return field.create_real_value(raw_value)
+
+    def release(self):
+        """Detaches from segment, last consumer removes it"""
+        if self.segment is None:
+            return
+
+        self.reader.release()
+        self.reader = None
+        buffer = self.segment.buf
+        buffer[self.descriptor.consumer_index] = 1
+        all_released = all(buffer[:self.descriptor.consumers])
+        del buffer
+        self.segment.close()
+
+        if all_released:
+            unlink_segment(self.segment)
+        self.segment = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+class SharedRow(object):
+    __slots__ = ('batch', 'row_index')
+
+    def __init__(self, batch, row_index):
+        self.batch = batch
+        self.row_index = row_index
+
+    def __getattr__(self, name):
+        try:
+            column_index = self.batch.reader.positions[name]
+        except KeyError:
+            raise AttributeError(name)
+        return self.batch.value(column_index, self.row_index)
+
+    def __iter__(self):
+        for column_index in range(len(self.batch.plan.field_names)):
+            yield self.batch.value(column_index, self.row_index)
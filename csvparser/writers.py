@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import csv
+import json
+
+
+class BatchWriter(object):
+    """
+    Base class for writers. Serializes typed values of parser rows using declared fields
+    and flushes them in batches of batch_size rows.
+    """
+    batch_size = 1000
+
+    def __init__(self, parser_class, batch_size=None):
+        plan = parser_class.get_plan(refresh=True)
+
+        self.parser_class = parser_class
+        self.field_names = list(plan.field_names)
+        self.fields = list(plan.fields)
+        self.serializers = plan.writer_serializers.get(type(self))
+        if self.serializers is None:
+            self.serializers = plan.writer_serializers[type(self)] = [self.get_serializer(field)
+                                                                      for field in self.fields]
+        if batch_size is not None:
+            self.batch_size = batch_size
+        self.buffer = []
+
+    def get_serializer(self, field):
+        """
+        Returns function converting typed value of field to value accepted by output. Serializers are
+        cached on plan of parser class per writer class, so they can depend only on field.
+        """
+        pass
+
+    def serialize(self, values):
+        return [serializer(value) for serializer, value in zip(self.serializers, values)]
+
+    def write_rows(self, rows):
+        """rows is iterable of parser instances"""
+        field_names = self.field_names
+        for row in rows:
+            self.buffer.append(self.serialize([getattr(row, field_name) for field_name in field_names]))
+            if len(self.buffer) >= self.batch_size:
+                self.flush()
+
+    def write_columns(self, columns):
+        """columns is dict mapping field name to sequence of typed values, all of the same length"""
+        missing_columns = [field_name for field_name in self.field_names if field_name not in columns]
+        if missing_columns:
+            raise ValueError('columns has no values for {field_names}'.format(field_names=', '.join(missing_columns)))
+
+        for values in zip(*[columns[field_name] for field_name in self.field_names]):
+            self.buffer.append(self.serialize(values))
+            if len(self.buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.write_batch(self.buffer)
+            self.buffer = []
+
+    def write_batch(self, batch):
+        pass
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # rows buffered before error are dropped, so partial batch is not written
+            self.buffer = []
+
+
+class CsvWriter(BatchWriter):
+    def __init__(self, parser_class, file_object, batch_size=None, csv_writer=csv.writer, write_header=False, **kwargs):
+        super(CsvWriter, self).__init__(parser_class, batch_size)
+        self.file_object = file_object
+        self.writer = csv_writer(file_object, **kwargs)
+
+        if write_header:
+            self.writer.writerow(self.field_names)
+
+    def get_serializer(self, field):
+        null_raw_value = field.null_raw_value()
+        create_raw_value = field.create_raw_value
+
+        def serializer(value):
+            if value is None:
+                return null_raw_value
+            return create_raw_value(value)
+
+        return serializer
+
+    def write_batch(self, batch):
+        self.writer.writerows(batch)
+
+
+class JsonLinesWriter(BatchWriter):
+    def __init__(self, parser_class, file_object, batch_size=None):
+        super(JsonLinesWriter, self).__init__(parser_class, batch_size)
+        self.file_object = file_object
+        self.encoder = json.JSONEncoder(ensure_ascii=False)
+
+    def get_serializer(self, field):
+        create_json_value = field.create_json_value
+
+        def serializer(value):
+            if value is None:
+                return None
+            return create_json_value(value)
+
+        return serializer
+
+    def write_batch(self, batch):
+        encode = self.encoder.encode
+        field_names = self.field_names
+        lines = [encode(dict(zip(field_names, values))) for values in batch]
+        lines.append('')
+        self.file_object.write('\n'.join(lines))
+
+
+class SqliteWriter(BatchWriter):
+    """
+    Inserts rows into sqlite table using executemany, one transaction per batch.
+    Table is created when it does not exist.
+    """
+    batch_size = 10000
+
+    def __init__(self, parser_class, connection, table_name, batch_size=None, create_table=True):
+        super(SqliteWriter, self).__init__(parser_class, batch_size)
+        self.connection = connection
+        self.table_name = table_name
+
+        quoted_names = [self.quote_name(field_name) for field_name in self.field_names]
+        self.insert_sql = 'INSERT INTO {table_name} ({columns}) VALUES ({placeholders})'.format(
+            table_name=self.quote_name(table_name),
+            columns=', '.join(quoted_names),
+            placeholders=', '.join(['?'] * len(quoted_names))
+        )
+
+        if create_table:
+            columns = ', '.join('{name} {sql_type}'.format(name=name, sql_type=field.sql_type)
+                                for name, field in zip(quoted_names, self.fields))
+            with self.connection:
+                self.connection.execute('CREATE TABLE IF NOT EXISTS {table_name} ({columns})'.format(
+                    table_name=self.quote_name(table_name), columns=columns))
+
+    @staticmethod
+    def quote_name(name):
+        return '"{name}"'.format(name=name.replace('"', '""'))
+
+    def get_serializer(self, field):
+        create_sql_value = field.create_sql_value
+
+        def serializer(value):
+            if value is None:
+                return None
+            return create_sql_value(value)
+
+        return serializer
+
+    def write_batch(self, batch):
+        with self.connection:
+            self.connection.executemany(self.insert_sql, batch)
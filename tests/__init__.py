@@ -2,4 +2,14 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 
 from . import test_fields
-from . import test_parser
\ No newline at end of file
+from . import test_parser
+from . import test_writers
+from . import test_index
+from . import test_follow
+from . import test_lazy
+from . import test_plan
+from . import test_cache
+from . import test_parallel
+from . import test_shared
+from . import test_inference
+from . import test_binary
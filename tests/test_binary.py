@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import unittest
+import os
+import csv
+import pickle
+import io
+import decimal
+import datetime
+import shutil
+import tempfile
+from csvparser.parser import Parser
+from csvparser import fields
+from csvparser import binary
+from csvparser import columns
+
+
+class AdImageField(fields.ParserField):
+    def create_real_value(self, raw_value):
+        width, height = raw_value.split('x')
+        return width, height
+
+
+class ClicksField(fields.IntegerField):
+    def create_real_value(self, raw_value):
+        return int(raw_value) * 2
+
+
+class AdPerformanceReportParser(Parser):
+    impressions = fields.IntegerField(null_symbols=['', '--'])
+    cost = fields.DecimalField(null_symbols=['--'])
+    ad_id = fields.CharField(null_symbols=['brak'])
+    date = fields.DateField('%Y-%m-%d')
+    ad_image = AdImageField()
+
+    fields_order = ['impressions', 'cost', 'ad_id', 'date', 'ad_image']
+
+
+class BytesTokenizerTestCase(unittest.TestCase):
+    def test(self):
+        tokenizer = binary.BytesTokenizer(csv.reader, {}, 'utf-8')
+        self.assertTrue(tokenizer.can_split)
+        self.assertEqual(tokenizer(b'1,2.5,abc\r\n'), [b'1', b'2.5', b'abc'])
+        self.assertEqual(tokenizer(b'1,"a,""b""\nc",'), [b'1', b'a,"b"\nc', b''])
+        self.assertEqual(tokenizer('1,żółw\n'.encode('utf-8')), [b'1', 'żółw'.encode('utf-8')])
+        self.assertEqual(tokenizer(b'\n'), [])
+
+    def test_reader_kwargs(self):
+        tokenizer = binary.BytesTokenizer(csv.reader, {'delimiter': str(';'), 'quotechar': str('|')}, 'utf-8')
+        self.assertEqual(tokenizer(b'1;|2;3|\n'), [b'1', b'2;3'])
+
+        tokenizer = binary.BytesTokenizer(csv.reader, {'skipinitialspace': True}, 'utf-8')
+        self.assertFalse(tokenizer.can_split)
+        self.assertEqual(tokenizer(b'1, 2\n'), [b'1', b'2'])
+
+        self.assertFalse(binary.BytesTokenizer(csv.reader, {}, 'shift_jis').can_split)
+        with self.assertRaises(ValueError):
+            binary.BytesTokenizer(csv.reader, {}, 'utf-16')
+        with self.assertRaises(ValueError):
+            binary.BytesTokenizer(csv.reader, {'quoting': csv.QUOTE_NONNUMERIC}, 'utf-8')
+
+
+class BinaryParserTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'report.csv')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create_file(self, text, encoding='utf-8'):
+        with io.open(self.file_path, 'w', encoding=encoding) as file:
+            file.write(text)
+
+    def test(self):
+        self.create_file('impressions,cost,ad_id,date,ad_image\n'
+                         '1000,50000.03,żółw,2016-09-30,3x2\n'
+                         '--,--,"brak",2016-12-20,"1x1"\n')
+        row1, row2 = AdPerformanceReportParser.parse_file(self.file_path, start_from_line=2, binary=True)
+
+        self.assertEqual(row1.__dict__[AdPerformanceReportParser.impressions.name], b'1000')
+        self.assertEqual(list(row1), [1000, decimal.Decimal('50000.03'), 'żółw', datetime.datetime(2016, 9, 30),
+                                      ('3', '2')])
+        self.assertEqual(list(row2), [None, None, None, datetime.datetime(2016, 12, 20), ('1', '1')])
+        self.assertTrue(row1.is_valid())
+
+        row2.impressions = '5'
+        self.assertEqual(row2.impressions, 5)
+
+        rows = list(AdPerformanceReportParser.parse_file(self.file_path, start_from_line=2))
+        self.assertEqual([list(row) for row in rows], [list(row1), [None, None, None, datetime.datetime(2016, 12, 20),
+                                                                    ('1', '1')]])
+
+    def test_binary_class(self):
+        self.create_file('1000,1.5,1,2016-09-30,3x2\n')
+        row, = AdPerformanceReportParser.parse_file(self.file_path, binary=True)
+
+        self.assertIsInstance(row, AdPerformanceReportParser)
+        self.assertIs(type(row).get_plan(), AdPerformanceReportParser.get_plan())
+        self.assertIs(type(row).impressions, AdPerformanceReportParser.impressions)
+
+        builder = columns.ColumnsBuilder(AdPerformanceReportParser.get_plan())
+        builder.append(row)
+        layout, data = builder.encode()
+        self.assertEqual(columns.ColumnsReader(bytes(data), layout, 1).column(4), ['3x2'])
+
+        row.impressions = 7
+        self.assertEqual(row.impressions, 7)
+
+        text_row = AdPerformanceReportParser.create_instance(['1', '1', '1', '2016-09-30', '1x1'])
+        text_row.impressions = b'5'
+        self.assertEqual(text_row.impressions, 5)
+
+    def test_overridden_create_real_value(self):
+        class ClicksParser(Parser):
+            clicks = ClicksField()
+
+            fields_order = ['clicks']
+
+        self.create_file('21\n')
+        row, = ClicksParser.parse_file(self.file_path, binary=True)
+        self.assertEqual(row.clicks, 42)
+
+    def test_encoding(self):
+        self.create_file('1000,1.5,żółw,2016-09-30,3x2\n', encoding='iso8859-2')
+        row, = AdPerformanceReportParser.parse_file(self.file_path, binary=True, encoding='iso8859-2')
+        self.assertEqual(row.ad_id, 'żółw')
+        self.assertEqual(row.impressions, 1000)
+
+        row, = AdPerformanceReportParser.parse_file(self.file_path, encoding='iso8859-2')
+        self.assertEqual(row.ad_id, 'żółw')
+
+    def test_pickle(self):
+        self.create_file('1000,--,żółw,2016-09-30,3x2\n')
+        row, = AdPerformanceReportParser.parse_file(self.file_path, binary=True)
+
+        loaded_row = pickle.loads(pickle.dumps(row))
+        self.assertIs(type(loaded_row), type(row))
+        self.assertEqual(list(loaded_row), list(row))
+
+    def test_not_supported(self):
+        self.create_file('1000,1.5,1,2016-09-30,3x2\n')
+        with self.assertRaises(ValueError):
+            AdPerformanceReportParser.parse_file(self.file_path, binary=True, lazy=True)
@@ -0,0 +1,159 @@
+import unittest
+import os
+import decimal
+import datetime
+import shutil
+import pickle
+import tempfile
+from csvparser.parser import Parser
+from csvparser import fields
+from csvparser import cache
+from csvparser import columns
+
+
+class AdImageField(fields.ParserField):
+    def create_real_value(self, raw_value):
+        width, height = raw_value.split('x')
+        return width, height
+
+
+class AdPerformanceReportParser(Parser):
+    impressions = fields.IntegerField(null_symbols=['--', ''])
+    cost = fields.DecimalField(null_symbols=['--'])
+    ad_id = fields.CharField()
+    date = fields.DateField('%Y-%m-%d')
+    ad_image = AdImageField(null_symbols=['--'])
+
+    fields_order = ['impressions', 'cost', 'ad_id', 'date', 'ad_image']
+
+
+class ColumnsTestCase(unittest.TestCase):
+    def test(self):
+        builder = columns.ColumnsBuilder(AdPerformanceReportParser.get_plan())
+        builder.append(AdPerformanceReportParser.create_instance(['1000', '50000.03', 'żółw', '2016-09-30', '3x2']))
+        builder.append(AdPerformanceReportParser.create_instance(['', '--', '', '2016-12-20', '--']))
+        layout, data = builder.encode()
+
+        reader = columns.ColumnsReader(bytes(data), layout, 2)
+        self.assertEqual(reader.column(0), [1000, None])
+        self.assertEqual(reader.column(1), [decimal.Decimal('50000.03'), None])
+        self.assertEqual(reader.column(2), ['żółw', ''])
+        self.assertEqual(reader.column(3), [datetime.datetime(2016, 9, 30), datetime.datetime(2016, 12, 20)])
+        self.assertEqual(reader.column(4), ['3x2', '--'])
+        self.assertEqual(reader.value(1, 0), decimal.Decimal('50000.03'))
+        self.assertEqual(reader.value(2, 0), 'żółw')
+        self.assertIsNone(reader.value(0, 1))
+
+    def test_too_big_integer(self):
+        builder = columns.ColumnsBuilder(AdPerformanceReportParser.get_plan())
+        builder.append(AdPerformanceReportParser.create_instance([str(2 ** 70), '1', 'a', '2016-09-30', '3x2']))
+        with self.assertRaises(columns.ColumnEncodeError):
+            builder.encode()
+
+
+class ResultCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_directory = os.path.join(self.directory, 'cache')
+        self.file_path = os.path.join(self.directory, 'report.csv')
+        self.write_file('impressions,cost,ad_id,date,ad_image\n'
+                        '1000,50000.03,1232188,2016-09-30,300x200\n'
+                        '--,--,8324125,2016-12-20,--\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_file(self, content, modification_time=1000000000):
+        with open(self.file_path, 'w') as file:
+            file.write(content)
+        os.utime(self.file_path, (modification_time, modification_time))
+
+    def parse(self, result_cache):
+        return [list(row) for row in AdPerformanceReportParser.parse_file(self.file_path, start_from_line=2,
+                                                                          cache=result_cache)]
+
+    def entries(self):
+        return [name for name in os.listdir(self.cache_directory) if name.endswith(cache.FILE_SUFFIX)]
+
+    def test(self):
+        result_cache = cache.ResultCache(self.cache_directory)
+        expected_rows = [
+            [1000, decimal.Decimal('50000.03'), '1232188', datetime.datetime(2016, 9, 30), ('300', '200')],
+            [None, None, '8324125', datetime.datetime(2016, 12, 20), None],
+        ]
+
+        self.assertEqual(self.parse(result_cache), expected_rows)
+        self.assertEqual(len(self.entries()), 1)
+
+        key = result_cache.get_key(AdPerformanceReportParser, self.file_path, 2, cache.csv.reader, {})
+        self.assertIsNotNone(result_cache.load(AdPerformanceReportParser, key))
+        self.assertEqual(self.parse(result_cache), expected_rows)
+
+        rows = AdPerformanceReportParser.parse_file(self.file_path, start_from_line=2, cache=result_cache)
+        row = next(rows)
+        self.assertTrue(row.is_valid())
+        row.impressions = '5'
+        self.assertEqual(row.impressions, 5)
+
+        row = pickle.loads(pickle.dumps(next(rows)))
+        self.assertEqual(list(row), expected_rows[1])
+        self.assertIsInstance(row, AdPerformanceReportParser)
+
+    def test_invalidation(self):
+        result_cache = cache.ResultCache(self.cache_directory)
+        self.parse(result_cache)
+        old_entries = self.entries()
+
+        self.write_file('impressions,cost,ad_id,date,ad_image\n'
+                        '7,1.5,1,2016-09-30,3x2\n', modification_time=1000000100)
+        self.assertEqual(self.parse(result_cache), [[7, decimal.Decimal('1.5'), '1', datetime.datetime(2016, 9, 30),
+                                                     ('3', '2')]])
+        self.assertEqual(len(self.entries()), 1)
+        self.assertNotEqual(self.entries(), old_entries)
+
+        class OtherParser(Parser):
+            impressions = fields.CharField()
+            cost = fields.CharField()
+            ad_id = fields.CharField()
+            date = fields.CharField()
+            ad_image = fields.CharField()
+
+            fields_order = ['impressions', 'cost', 'ad_id', 'date', 'ad_image']
+
+        self.assertNotEqual(result_cache.get_key(OtherParser, self.file_path, 2, cache.csv.reader, {}),
+                            result_cache.get_key(AdPerformanceReportParser, self.file_path, 2, cache.csv.reader, {}))
+
+    def test_different_parsers_and_arguments(self):
+        class OtherParser(Parser):
+            impressions = fields.CharField()
+            cost = fields.CharField()
+            ad_id = fields.CharField()
+            date = fields.CharField()
+            ad_image = fields.CharField()
+
+            fields_order = ['impressions', 'cost', 'ad_id', 'date', 'ad_image']
+
+        result_cache = cache.ResultCache(self.cache_directory)
+        for i in range(2):
+            for parser_class in (AdPerformanceReportParser, OtherParser):
+                list(parser_class.parse_file(self.file_path, start_from_line=2, cache=result_cache))
+        list(OtherParser.parse_file(self.file_path, start_from_line=1, cache=result_cache))
+        self.assertEqual(len(self.entries()), 3)
+
+        for parser_class, start_from_line in ((AdPerformanceReportParser, 2), (OtherParser, 2), (OtherParser, 1)):
+            key = result_cache.get_key(parser_class, self.file_path, start_from_line, cache.csv.reader, {})
+            self.assertIsNotNone(result_cache.load(parser_class, key))
+
+    def test_eviction(self):
+        result_cache = cache.ResultCache(self.cache_directory, max_size=0)
+        self.parse(result_cache)
+        self.assertEqual(self.entries(), [])
+
+    def test_not_convertible_rows_are_not_cached(self):
+        self.write_file('impressions,cost,ad_id,date,ad_image\n'
+                        'abc,1.5,1,2016-09-30,3x2\n')
+        result_cache = cache.ResultCache(self.cache_directory)
+        rows = list(AdPerformanceReportParser.parse_file(self.file_path, start_from_line=2, cache=result_cache))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(self.entries(), [])
@@ -0,0 +1,97 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+from csvparser.parser import Parser
+from csvparser import fields
+from csvparser import follow
+
+
+class AdPerformanceReportParser(Parser):
+    impressions = fields.IntegerField()
+    clicks = fields.IntegerField()
+    ad_id = fields.CharField()
+
+    fields_order = ['impressions', 'clicks', 'ad_id']
+
+
+class SplitCompleteRecordsTestCase(unittest.TestCase):
+    def test(self):
+        records, tail_offset = follow.split_complete_records(b'1,2,a\n3,4,"b\nc"\n5,6,"d\n7,8')
+        self.assertEqual(records, [b'1,2,a\n', b'3,4,"b\nc"\n'])
+        self.assertEqual(tail_offset, 16)
+
+        records, tail_offset = follow.split_complete_records(b'1,2,"a\n', quotechar=None)
+        self.assertEqual(records, [b'1,2,"a\n'])
+        self.assertEqual(tail_offset, 7)
+
+
+class FileFollowerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'report.csv')
+        with open(self.file_path, 'w') as file:
+            file.write('impressions,clicks,ad_id\n1000,200,1232188\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def append(self, data):
+        with open(self.file_path, 'a') as file:
+            file.write(data)
+        time.sleep(0.05)
+
+    def test_appended_rows(self):
+        stop_event = threading.Event()
+
+        def write():
+            self.append('56000,3224,')
+            self.append('8324125\n300,20,"55')
+            self.append('\n53"\n')
+            stop_event.set()
+
+        follower = AdPerformanceReportParser.follow_file(self.file_path, start_from_line=2, poll_interval=0.01,
+                                                         max_poll_interval=0.05, stop_event=stop_event)
+        writer = threading.Thread(target=write)
+        writer.start()
+        rows = list(follower)
+        writer.join()
+
+        self.assertEqual([list(row) for row in rows], [[1000, 200, '1232188'],
+                                                       [56000, 3224, '8324125'],
+                                                       [300, 20, '55\n53']])
+        self.assertEqual(follower.offset, os.path.getsize(self.file_path))
+
+    def test_truncated_and_rotated_file(self):
+        stop_event = threading.Event()
+        rows = []
+
+        def write():
+            while len(rows) < 1:
+                time.sleep(0.01)
+            with open(self.file_path, 'w') as file:
+                file.write('impressions,clicks,ad_id\n1,2,3\n')
+            while len(rows) < 2:
+                time.sleep(0.01)
+            os.rename(self.file_path, self.file_path + '.1')
+            with open(self.file_path, 'w') as file:
+                file.write('impressions,clicks,ad_id\n4,5,6\n')
+            while len(rows) < 3:
+                time.sleep(0.01)
+            stop_event.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        for row in AdPerformanceReportParser.follow_file(self.file_path, start_from_line=2, poll_interval=0.01,
+                                                         max_poll_interval=0.05, stop_event=stop_event):
+            rows.append(list(row))
+        writer.join()
+
+        self.assertEqual(rows, [[1000, 200, '1232188'], [1, 2, '3'], [4, 5, '6']])
+
+    def test_idle_timeout(self):
+        rows = list(AdPerformanceReportParser.follow_file(self.file_path, start_from_line=2, poll_interval=0.01,
+                                                          idle_timeout=0.05))
+        self.assertEqual(len(rows), 1)
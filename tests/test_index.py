@@ -0,0 +1,95 @@
+import unittest
+import os
+import io
+import decimal
+from csvparser.parser import Parser
+from csvparser import fields
+from csvparser import index
+
+
+class AdPerformanceReportParser(Parser):
+    impressions = fields.IntegerField()
+    clicks = fields.IntegerField()
+    conversions = fields.IntegerField()
+    cost = fields.DecimalField()
+    ad_id = fields.CharField()
+
+    fields_order = ['impressions', 'clicks', 'conversions', 'cost', 'ad_id']
+    index_key = 'ad_id'
+
+
+class KeyIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.test_file_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            'test_files', 'adperformancereport_with_headers_and_duplicated_keys.csv')
+
+    def test_first(self):
+        key_index = AdPerformanceReportParser.create_index()
+        rows = list(AdPerformanceReportParser.parse_file(self.test_file_path, start_from_line=2, index=key_index))
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(len(key_index), 3)
+        self.assertIn('1232188', key_index)
+        self.assertNotIn('0000000', key_index)
+        self.assertEqual(key_index.duplicates, {'1232188': 1})
+        self.assertEqual(key_index.fetch('1232188').impressions, 1000)
+        self.assertEqual(key_index.fetch('5553311').cost, decimal.Decimal('1500.50'))
+        self.assertEqual([row.ad_id for row in key_index.rows()], ['1232188', '8324125', '5553311'])
+
+    def test_last(self):
+        key_index = AdPerformanceReportParser.create_index(policy='last')
+        list(AdPerformanceReportParser.parse_file(self.test_file_path, start_from_line=2, index=key_index))
+
+        self.assertEqual(key_index.fetch('1232188').impressions, 1200)
+        self.assertEqual([row.ad_id for row in key_index.rows()], ['8324125', '1232188', '5553311'])
+
+    def test_error(self):
+        key_index = AdPerformanceReportParser.create_index(policy='error')
+        rows = AdPerformanceReportParser.parse_file(self.test_file_path, start_from_line=2, index=key_index)
+
+        with self.assertRaises(index.DuplicateKeyError):
+            list(rows)
+
+    def test_composite_key(self):
+        key_index = AdPerformanceReportParser.create_index(key=('ad_id', 'conversions'))
+        list(AdPerformanceReportParser.parse_file(self.test_file_path, start_from_line=2, index=key_index))
+
+        self.assertEqual(len(key_index), 4)
+        self.assertEqual(key_index.fetch(('1232188', 7)).clicks, 210)
+
+    def test_byte_offsets(self):
+        key_index = AdPerformanceReportParser.create_index()
+        list(AdPerformanceReportParser.parse_file(self.test_file_path, start_from_line=2, index=key_index))
+
+        with open(self.test_file_path, 'rb') as file:
+            lines = file.readlines()
+        self.assertIsNotNone(key_index.encoding)
+        self.assertEqual(key_index.get('8324125'), len(lines[0]) + len(lines[1]))
+
+    def test_binary(self):
+        key_index = AdPerformanceReportParser.create_index()
+        list(AdPerformanceReportParser.parse_file(self.test_file_path, start_from_line=2, index=key_index,
+                                                  binary=True))
+
+        self.assertEqual(key_index.fetch('1232188').impressions, 1000)
+        self.assertEqual(key_index.fetch('5553311').ad_id, '5553311')
+        self.assertEqual([row.ad_id for row in key_index.rows()], ['1232188', '8324125', '5553311'])
+
+    def test_file_without_buffer(self):
+        with open(self.test_file_path) as file:
+            content = file.read()
+
+        key_index = AdPerformanceReportParser.create_index()
+        list(AdPerformanceReportParser.parse_file_object(io.StringIO(content), start_from_line=2, index=key_index))
+
+        lines = content.splitlines(True)
+        self.assertIsNone(key_index.encoding)
+        self.assertEqual(key_index.get('8324125'), len(lines[0]) + len(lines[1]))
+
+    def test_wrong_arguments(self):
+        with self.assertRaises(ValueError):
+            AdPerformanceReportParser.create_index(key='unknown')
+
+        with self.assertRaises(ValueError):
+            AdPerformanceReportParser.create_index(policy='unknown')
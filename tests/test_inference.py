@@ -0,0 +1,113 @@
+import unittest
+import os
+import decimal
+import datetime
+import shutil
+import tempfile
+from csvparser.parser import Parser
+from csvparser import fields
+from csvparser import inference
+
+
+TEST_FILES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_files')
+
+
+class InferenceTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def create_file(self, lines):
+        file_path = os.path.join(self.directory, 'report.csv')
+        with open(file_path, 'w') as file:
+            file.write('\n'.join(lines) + '\n')
+        return file_path
+
+    def test_infer(self):
+        file_path = os.path.join(TEST_FILES_DIRECTORY,
+                                 'adperformancereport_with_headers_and_null_values_and_date_field.csv')
+        parser_class = Parser.infer(file_path)
+
+        self.assertTrue(issubclass(parser_class, Parser))
+        self.assertEqual(parser_class.fields_order, ['impressions', 'clicks', 'conversions', 'cost', 'ad_id', 'date'])
+        self.assertIsInstance(parser_class.impressions, fields.CharField)
+        self.assertEqual(parser_class.impressions.null_symbols, [''])
+        self.assertIsInstance(parser_class.clicks, fields.IntegerField)
+        self.assertIsInstance(parser_class.cost, fields.DecimalField)
+        self.assertIsInstance(parser_class.date, fields.DateField)
+        self.assertEqual(parser_class.date.date_format, '%Y-%m-%d')
+        self.assertEqual(parser_class.start_from_line, 2)
+
+        rows = list(parser_class.parse_file(file_path))
+        self.assertEqual(rows[0].clicks, 200)
+        self.assertEqual(rows[0].cost, decimal.Decimal('50000.03'))
+        self.assertEqual(rows[0].date, datetime.datetime(2016, 9, 30))
+        self.assertIsNone(rows[0].impressions)
+
+    def test_types_and_null_symbols(self):
+        file_path = self.create_file([
+            'id,account,clicks,ctr,day,country,class',
+            '1,007,10,0.5,30/09/2016,pl,a',
+            '2,008,--,1.25,01/10/2016,pl,b',
+            '3,009,5,N/A,02/10/2016,de,c',
+            '4,010,7,2,03/10/2016,pl,d',
+            '5,011,1,3,04/10/2016,de,e',
+        ])
+        schema = inference.infer_schema(file_path)
+
+        self.assertTrue(schema.has_header)
+        self.assertEqual(schema.start_from_line, 2)
+        self.assertEqual(schema.sampled_rows, 5)
+        self.assertEqual([column.name for column in schema.columns],
+                         ['id', 'account', 'clicks', 'ctr', 'day', 'country', 'class_'])
+        self.assertEqual([column.field_class for column in schema.columns],
+                         [fields.IntegerField, fields.CharField, fields.IntegerField, fields.DecimalField,
+                          fields.DateField, fields.CharField, fields.CharField])
+        self.assertEqual(schema.columns[2].null_symbols, ['--'])
+        self.assertEqual(schema.columns[3].null_symbols, ['N/A'])
+        self.assertEqual(schema.columns[4].date_format, '%d/%m/%Y')
+        self.assertTrue(schema.columns[5].low_cardinality)
+        self.assertFalse(schema.columns[6].low_cardinality)
+
+    def test_source(self):
+        file_path = self.create_file(['name,clicks,day', 'a,1,2016-09-30', 'a,--,2016-10-01', 'a,3,2016-10-02'])
+        source = inference.infer_schema(file_path).source('ReportParser')
+
+        self.assertIn("clicks = fields.IntegerField(null_symbols=['--'])", source)
+        self.assertIn("day = fields.DateField('%Y-%m-%d')", source)
+        self.assertIn('# low cardinality', source)
+        self.assertIn('    start_from_line = 2', source)
+
+        namespace = {}
+        exec(source, namespace)
+        rows = list(namespace['ReportParser'].parse_file(file_path))
+        self.assertEqual([row.clicks for row in rows], [1, None, 3])
+
+    def test_without_header(self):
+        schema = inference.infer_schema(os.path.join(TEST_FILES_DIRECTORY, 'adperformancereport.csv'))
+
+        self.assertFalse(schema.has_header)
+        self.assertEqual([column.name for column in schema.columns],
+                         ['column_1', 'column_2', 'column_3', 'column_4', 'column_5'])
+        self.assertEqual(schema.columns[3].field_class, fields.DecimalField)
+        self.assertEqual(schema.create_parser(Parser).start_from_line, 1)
+
+    def test_sample_rows(self):
+        file_path = self.create_file(['clicks'] + [str(i) for i in range(100)] + ['many'])
+
+        self.assertEqual(inference.infer_schema(file_path, sample_rows=100).columns[0].field_class,
+                         fields.IntegerField)
+        self.assertEqual(inference.infer_schema(file_path, sample_rows=101).columns[0].field_class,
+                         fields.CharField)
+
+        schema = inference.infer_schema(file_path, sample_rows=10, reservoir_rows=50)
+        self.assertEqual(schema.sampled_rows, 10)
+        self.assertEqual(schema.columns[0].field_class, fields.IntegerField)
+
+    def test_reservoir_sample(self):
+        sample = inference.reservoir_sample(iter(range(1000)), 10)
+        self.assertEqual(len(sample), 10)
+        self.assertEqual(len(set(sample)), 10)
+        self.assertEqual(inference.reservoir_sample(iter(range(5)), 10), [0, 1, 2, 3, 4])
@@ -0,0 +1,79 @@
+import unittest
+import os
+import pickle
+import csv
+import decimal
+from csvparser.parser import Parser
+from csvparser import fields
+from csvparser import lazy
+
+
+class AdPerformanceReportParser(Parser):
+    impressions = fields.IntegerField()
+    clicks = fields.IntegerField()
+    conversions = fields.IntegerField()
+    cost = fields.DecimalField()
+    ad_id = fields.CharField()
+
+    fields_order = ['impressions', 'clicks', 'conversions', 'cost', 'ad_id']
+
+
+class IterRawRecordsTestCase(unittest.TestCase):
+    def test(self):
+        lines = ['1,2\n', '3,"4\n', '5"\n', '"6",7\n', '8,"9']
+        self.assertEqual(list(lazy.iter_raw_records(lines)), ['1,2\n', '3,"4\n5"\n', '"6",7\n', '8,"9'])
+        self.assertEqual(list(lazy.iter_raw_records(lines, quotechar=None)), lines)
+
+    def test_get_quotechar(self):
+        self.assertEqual(lazy.get_quotechar({}), '"')
+        self.assertEqual(lazy.get_quotechar({'quotechar': '|'}), '|')
+        self.assertEqual(lazy.get_quotechar({'dialect': csv.excel_tab}), '"')
+        self.assertIsNone(lazy.get_quotechar({'quoting': csv.QUOTE_NONE}))
+
+    def test_record_tokenizer(self):
+        tokenizer = lazy.RecordTokenizer(csv.reader, {}, AdPerformanceReportParser.get_plan())
+        self.assertTrue(tokenizer.can_split)
+        self.assertEqual(tokenizer('1,2,,x\r\n'), ['1', '2', '', 'x'])
+        self.assertEqual(tokenizer('1,"2,3"\n'), ['1', '2,3'])
+        self.assertEqual(tokenizer('"4\n5",6\n'), ['4\n5', '6'])
+        self.assertEqual(tokenizer('\n'), [])
+
+        tokenizer = lazy.RecordTokenizer(csv.reader, {'quoting': csv.QUOTE_NONNUMERIC},
+                                         AdPerformanceReportParser.get_plan())
+        self.assertFalse(tokenizer.can_split)
+        self.assertEqual(tokenizer('1,"x"\n'), [1.0, 'x'])
+
+
+class LazyParserTestCase(unittest.TestCase):
+    def setUp(self):
+        self.test_file_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            'test_files', 'adperformancereport_with_headers_and_custom_reader.csv')
+
+    def test(self):
+        rows = AdPerformanceReportParser.parse_file(self.test_file_path, start_from_line=2, lazy=True,
+                                                    delimiter=str(';'), quotechar=str('|'))
+        row1, row2 = rows
+
+        self.assertIn('_raw_record', row1.__dict__)
+        self.assertEqual(row1.ad_id, '1232188')
+        self.assertNotIn('_raw_record', row1.__dict__)
+        self.assertEqual(list(row1), [1000, 200, 5, decimal.Decimal('50000.03'), '1232188'])
+
+        row2.clicks = '1'
+        self.assertEqual(list(row2), [56000, 1, 900, decimal.Decimal('202000.44'), '8324125'])
+        self.assertTrue(row2.is_valid())
+
+        with self.assertRaises(AttributeError):
+            row2.unknown_attribute
+
+    def test_pickle(self):
+        rows = AdPerformanceReportParser.parse_file(self.test_file_path, start_from_line=2, lazy=True,
+                                                    delimiter=str(';'), quotechar=str('|'))
+        row1, row2 = rows
+        row2.ad_id
+
+        loaded_row1, loaded_row2 = pickle.loads(pickle.dumps([row1, row2]))
+        self.assertIsInstance(loaded_row1, AdPerformanceReportParser)
+        self.assertEqual(list(loaded_row1), list(row1))
+        self.assertEqual(list(loaded_row2), list(row2))
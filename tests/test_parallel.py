@@ -0,0 +1,108 @@
+import unittest
+import os
+import shutil
+import tempfile
+from csvparser.parser import Parser
+from csvparser import fields
+from csvparser import validators
+from csvparser import parallel
+
+
+class AdPerformanceReportParser(Parser):
+    impressions = fields.IntegerField(validators=[validators.IntegerFieldMinValidator(min_value=0)])
+    clicks = fields.IntegerField()
+    ad_id = fields.CharField()
+
+    fields_order = ['impressions', 'clicks', 'ad_id']
+
+
+class SplitFileTestCase(unittest.TestCase):
+    def test(self):
+        directory = tempfile.mkdtemp()
+        try:
+            file_path = os.path.join(directory, 'report.csv')
+            with open(file_path, 'wb') as file:
+                file.write(b'aaaa\nbb\ncccccc\nd\n')
+
+            self.assertEqual(parallel.split_file(file_path, 17, None), [(0, 17)])
+            self.assertEqual(parallel.split_file(file_path, 17, 100), [(0, 17)])
+            self.assertEqual(parallel.split_file(file_path, 17, 3), [(0, 5), (5, 15), (15, 17)])
+            self.assertEqual(parallel.split_file(file_path, 17, 5), [(0, 8), (8, 15), (15, 17)])
+        finally:
+            shutil.rmtree(directory)
+
+
+class ParseManyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.write_file('small.csv', ['1,2,a'])
+        self.write_file('big.csv', ['{i},{i},b{i}'.format(i=i) for i in range(100)])
+        self.write_file('dirty.csv', ['-1,2,c', 'x,2,c', '3,3', '4,4,d'])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_file(self, name, lines):
+        with open(os.path.join(self.directory, name), 'w') as file:
+            file.write('impressions,clicks,ad_id\n')
+            for line in lines:
+                file.write(line + '\n')
+
+    def parse(self, **kwargs):
+        result = AdPerformanceReportParser.parse_many(os.path.join(self.directory, '*.csv'), start_from_line=2,
+                                                      validate=True, **kwargs)
+        rows = sorted((os.path.basename(file_path), line_num, row.ad_id) for file_path, line_num, row in result)
+        return rows, result.stats
+
+    def test(self):
+        for kwargs in [{'workers': 1}, {'workers': 2}, {'workers': 2, 'split_size': 64}]:
+            rows, stats = self.parse(**kwargs)
+
+            self.assertEqual(len(rows), 104)
+            self.assertIn(('big.csv', 2, 'b0'), rows)
+            self.assertIn(('big.csv', 101, 'b99'), rows)
+            self.assertIn(('dirty.csv', 5, 'd'), rows)
+            self.assertIn(('small.csv', 2, 'a'), rows)
+
+            self.assertEqual(stats.files[os.path.join(self.directory, 'big.csv')].rows, 100)
+            dirty_stats = stats.files[os.path.join(self.directory, 'dirty.csv')]
+            self.assertEqual(dirty_stats.rows, 3)
+            self.assertEqual(dirty_stats.invalid_rows, 2)
+            self.assertEqual(dirty_stats.errors, {'impressions lower than min': 1, 'ValueError': 1})
+            self.assertEqual(dirty_stats.failures, ['line 4: row has 2 values, but parser has 3 fields'])
+            self.assertEqual(stats.total.rows, 104)
+            self.assertEqual(stats.total.invalid_rows, 2)
+
+    def test_start_from_line_after_first_chunk(self):
+        for workers in [1, 2]:
+            result = AdPerformanceReportParser.parse_many(os.path.join(self.directory, 'dirty.csv'), workers=workers,
+                                                          start_from_line=4, validate=True, split_size=8)
+            rows = sorted((line_num, row.ad_id) for file_path, line_num, row in result)
+            self.assertEqual(rows, [(5, 'd')])
+
+            dirty_stats = result.stats.files[os.path.join(self.directory, 'dirty.csv')]
+            self.assertEqual((dirty_stats.rows, dirty_stats.invalid_rows, dirty_stats.errors), (1, 0, {}))
+            self.assertEqual(dirty_stats.failures, ['line 4: row has 2 values, but parser has 3 fields'])
+
+    def test_chunks_in_order(self):
+        results = [('a', 1, 2, [], [], None), ('b', 0, 3, [], [], None), ('a', 0, 5, [], [], None),
+                   ('a', 2, 1, [], [], None)]
+        chunks = [(result[0], result[1], first_line)
+                  for first_line, result in parallel.ParseManyResult.order_chunks(results)]
+        self.assertEqual(chunks, [('b', 0, 1), ('a', 0, 1), ('a', 1, 6), ('a', 2, 8)])
+
+    def test_errors(self):
+        for workers in [1, 2]:
+            result = AdPerformanceReportParser.parse_many(os.path.join(self.directory, 'dirty.csv'), workers=workers,
+                                                          start_from_line=2, validate=True)
+            errors = sorted((line_num, row.errors) for file_path, line_num, row in result)
+            self.assertEqual(errors, [(2, ['impressions lower than min']), (3, ['ValueError']), (5, [])])
+
+        result = AdPerformanceReportParser.parse_many(os.path.join(self.directory, 'small.csv'), workers=1,
+                                                      start_from_line=2)
+        self.assertEqual([row.errors for file_path, line_num, row in result], [None])
+
+    def test_paths(self):
+        file_path = os.path.join(self.directory, 'small.csv')
+        result = AdPerformanceReportParser.parse_many([file_path], workers=1, start_from_line=2)
+        self.assertEqual([(path, line_num, list(row)) for path, line_num, row in result], [(file_path, 2, [1, 2, 'a'])])
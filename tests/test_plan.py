@@ -0,0 +1,97 @@
+import unittest
+import pickle
+import decimal
+from csvparser.parser import Parser
+from csvparser import fields
+from csvparser import validators
+from csvparser import plan
+
+
+class AdPerformanceReportParser(Parser):
+    impressions = fields.IntegerField(validators=[validators.IntegerFieldMinValidator(min_value=0)])
+    cost = fields.DecimalField(validators=[validators.DecimalFieldMaxValidator(max_value=decimal.Decimal('10.00'))])
+    ad_id = fields.CharField()
+
+    fields_order = ['impressions', 'cost', 'ad_id']
+
+
+class SameAdPerformanceReportParser(Parser):
+    impressions = fields.IntegerField(validators=[validators.IntegerFieldMinValidator(min_value=0)])
+    cost = fields.DecimalField(validators=[validators.DecimalFieldMaxValidator(max_value=decimal.Decimal('10.00'))])
+    ad_id = fields.CharField()
+
+    fields_order = ['impressions', 'cost', 'ad_id']
+
+
+class OtherAdPerformanceReportParser(Parser):
+    impressions = fields.IntegerField(validators=[validators.IntegerFieldMinValidator(min_value=1)])
+    cost = fields.DecimalField(validators=[validators.DecimalFieldMaxValidator(max_value=decimal.Decimal('10.00'))])
+    ad_id = fields.CharField()
+
+    fields_order = ['impressions', 'cost', 'ad_id']
+
+
+class ParserPlanTestCase(unittest.TestCase):
+    def test_cached(self):
+        class TestParser(Parser):
+            field1 = fields.IntegerField()
+            field2 = fields.CharField()
+
+            fields_order = ['field1', 'field2']
+
+        test_plan = TestParser.get_plan()
+        self.assertIs(TestParser.get_plan(), test_plan)
+        self.assertEqual(test_plan.field_names, ('field1', 'field2'))
+
+        TestParser.fields_order = ['field2', 'field1']
+        self.assertEqual(TestParser.get_plan().field_names, ('field2', 'field1'))
+
+        TestParser.fields_order = ['field2', 'field3']
+        with self.assertRaises(ValueError):
+            TestParser.get_plan()
+
+    def test_changed_fields(self):
+        class TestParser(Parser):
+            field1 = fields.IntegerField()
+            field2 = fields.CharField()
+
+            fields_order = ['field1']
+
+        self.assertEqual(list(TestParser.create_instance(['1', 'x'])), [1])
+
+        TestParser.fields_order.append('field2')
+        self.assertEqual(list(TestParser.create_instance(['1', 'x'])), [1, 'x'])
+
+        TestParser.field1 = fields.CharField()
+        self.assertEqual(list(TestParser.create_instance(['1', 'x'])), ['1', 'x'])
+
+        # rows do not check fields on every access, change is picked up by next parse call
+        row = TestParser.create_instance(['1', 'x'])
+        TestParser.fields_order.remove('field2')
+        self.assertEqual(list(row), ['1', 'x'])
+        self.assertEqual(TestParser.get_plan(refresh=True).field_names, ('field1',))
+        self.assertEqual(list(row), ['1'])
+
+    def test_create_instance(self):
+        instance = AdPerformanceReportParser.create_instance(['5', '1.5', 'abc'])
+        self.assertEqual(list(instance), [5, decimal.Decimal('1.5'), 'abc'])
+
+        with self.assertRaises(IndexError):
+            AdPerformanceReportParser.create_instance(['5', '1.5'])
+
+    def test_schema_hash(self):
+        self.assertEqual(AdPerformanceReportParser.get_plan().schema_hash,
+                         SameAdPerformanceReportParser.get_plan().schema_hash)
+        self.assertNotEqual(AdPerformanceReportParser.get_plan().schema_hash,
+                            OtherAdPerformanceReportParser.get_plan().schema_hash)
+
+    def test_dump_and_load(self):
+        data = plan.dump_plans([AdPerformanceReportParser])
+        schema_hash = AdPerformanceReportParser.get_plan().schema_hash
+        del AdPerformanceReportParser._parser_plan
+
+        loaded_plan, = plan.load_plans(data)
+        self.assertIs(AdPerformanceReportParser.get_plan(), loaded_plan)
+        self.assertEqual(loaded_plan.schema_hash, schema_hash)
+        self.assertEqual(plan.load_plans(data), [loaded_plan])
+        self.assertIs(pickle.loads(pickle.dumps(loaded_plan)), loaded_plan)
@@ -0,0 +1,81 @@
+import unittest
+import decimal
+import datetime
+import multiprocessing
+from csvparser.parser import Parser
+from csvparser import fields
+from csvparser import shared
+
+
+class AdImageField(fields.ParserField):
+    def create_real_value(self, raw_value):
+        width, height = raw_value.split('x')
+        return width, height
+
+
+class AdPerformanceReportParser(Parser):
+    impressions = fields.IntegerField(null_symbols=['--'])
+    cost = fields.DecimalField()
+    ad_id = fields.CharField()
+    date = fields.DateField('%Y-%m-%d')
+    ad_image = AdImageField(null_symbols=['--'])
+
+    fields_order = ['impressions', 'cost', 'ad_id', 'date', 'ad_image']
+
+
+def consume(descriptor_queue, result_queue):
+    descriptor = descriptor_queue.get()
+    with descriptor.attach() as batch:
+        result_queue.put((sum(batch.column('impressions')[:1]), [row.ad_id for row in batch]))
+
+
+@unittest.skipIf(shared.shared_memory is None, 'multiprocessing.shared_memory is not available')
+class SharedBatchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            AdPerformanceReportParser.create_instance(['1000', '50000.03', '1232188', '2016-09-30', '300x200']),
+            AdPerformanceReportParser.create_instance(['--', '202000.44', '8324125', '2016-12-20', '--']),
+        ]
+
+    def test(self):
+        descriptor, = shared.publish(AdPerformanceReportParser, self.rows)
+        batch = descriptor.attach()
+
+        self.assertEqual(len(batch), 2)
+        self.assertEqual(list(batch[0]), [1000, decimal.Decimal('50000.03'), '1232188',
+                                          datetime.datetime(2016, 9, 30), ('300', '200')])
+        self.assertIsNone(batch[1].impressions)
+        self.assertIsNone(batch[1].ad_image)
+        self.assertEqual(batch[1].cost, decimal.Decimal('202000.44'))
+        self.assertEqual(batch.column('ad_image'), [('300', '200'), None])
+
+        with self.assertRaises(AttributeError):
+            batch[0].unknown_field
+        with self.assertRaises(IndexError):
+            batch[2]
+
+        batch.release()
+        with self.assertRaises(FileNotFoundError):
+            descriptor.attach()
+
+    def test_without_consumers(self):
+        with self.assertRaises(ValueError):
+            shared.publish(AdPerformanceReportParser, self.rows, consumers=0)
+
+    def test_consumer_processes(self):
+        descriptors = shared.publish(AdPerformanceReportParser, self.rows, consumers=2)
+        descriptor_queue = multiprocessing.Queue()
+        result_queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=consume, args=(descriptor_queue, result_queue))
+        process.start()
+        descriptor_queue.put(descriptors[0])
+        result = result_queue.get(timeout=10)
+        process.join()
+
+        self.assertEqual(result, (1000, ['1232188', '8324125']))
+
+        with descriptors[1].attach() as batch:
+            self.assertEqual(batch.column('ad_id'), ['1232188', '8324125'])
+
+        with self.assertRaises(FileNotFoundError):
+            descriptors[1].attach()
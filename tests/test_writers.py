@@ -0,0 +1,111 @@
+import unittest
+import os
+import io
+import json
+import sqlite3
+import decimal
+import datetime
+import tempfile
+from csvparser.parser import Parser
+from csvparser import fields
+from csvparser import writers
+
+
+class AdPerformanceReportParser(Parser):
+    impressions = fields.IntegerField(null_symbols=['--', ''])
+    cost = fields.DecimalField()
+    ad_id = fields.CharField()
+    date = fields.DateField('%Y-%m-%d')
+
+    fields_order = ['impressions', 'cost', 'ad_id', 'date']
+
+
+def create_row(impressions, cost, ad_id, date):
+    row = AdPerformanceReportParser()
+    row.impressions = impressions
+    row.cost = cost
+    row.ad_id = ad_id
+    row.date = date
+    return row
+
+
+class WritersTestCase(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            create_row('1000', '50000.03', '1232188', '2016-09-30'),
+            create_row('--', '202000.44', '8324125', '2016-12-20'),
+        ]
+
+    def test_csv_writer(self):
+        output = io.StringIO()
+        with writers.CsvWriter(AdPerformanceReportParser, output, batch_size=1, lineterminator='\n') as writer:
+            writer.write_rows(self.rows)
+
+        self.assertEqual(output.getvalue(), '1000,50000.03,1232188,2016-09-30\n'
+                                            '--,202000.44,8324125,2016-12-20\n')
+
+    def test_csv_writer_with_columns(self):
+        output = io.StringIO()
+        with writers.CsvWriter(AdPerformanceReportParser, output, write_header=True, lineterminator='\n') as writer:
+            writer.write_columns({
+                'impressions': [1000, None],
+                'cost': [decimal.Decimal('50000.03'), decimal.Decimal('202000.44')],
+                'ad_id': ['1232188', '8324125'],
+                'date': [datetime.datetime(2016, 9, 30), datetime.datetime(2016, 12, 20)],
+            })
+
+        self.assertEqual(output.getvalue(), 'impressions,cost,ad_id,date\n'
+                                            '1000,50000.03,1232188,2016-09-30\n'
+                                            '--,202000.44,8324125,2016-12-20\n')
+
+        with self.assertRaises(ValueError):
+            writers.CsvWriter(AdPerformanceReportParser, output).write_columns({'impressions': [1]})
+
+    def test_write_file_round_trip(self):
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        os.close(handle)
+        try:
+            AdPerformanceReportParser.write_file(self.rows, path)
+            rows = list(AdPerformanceReportParser.parse_file(path))
+        finally:
+            os.remove(path)
+
+        self.assertEqual([list(row) for row in rows], [list(row) for row in self.rows])
+
+    def test_json_lines_writer(self):
+        output = io.StringIO()
+        with writers.JsonLinesWriter(AdPerformanceReportParser, output) as writer:
+            writer.write_rows(self.rows)
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(lines, [
+            {'impressions': 1000, 'cost': '50000.03', 'ad_id': '1232188', 'date': '2016-09-30'},
+            {'impressions': None, 'cost': '202000.44', 'ad_id': '8324125', 'date': '2016-12-20'},
+        ])
+
+    def test_sqlite_writer(self):
+        connection = sqlite3.connect(':memory:')
+        with writers.SqliteWriter(AdPerformanceReportParser, connection, 'report', batch_size=1) as writer:
+            writer.write_rows(self.rows)
+
+        self.assertEqual(connection.execute('SELECT * FROM report ORDER BY ad_id').fetchall(), [
+            (1000, '50000.03', '1232188', '2016-09-30'),
+            (None, '202000.44', '8324125', '2016-12-20'),
+        ])
+
+    def test_error_inside_with(self):
+        connection = sqlite3.connect(':memory:')
+        with self.assertRaises(ValueError):
+            with writers.SqliteWriter(AdPerformanceReportParser, connection, 'report', batch_size=10) as writer:
+                writer.write_rows(self.rows)
+                raise ValueError('next rows can not be read')
+
+        self.assertEqual(connection.execute('SELECT * FROM report').fetchall(), [])
+
+    def test_serializers_are_cached(self):
+        first_writer = writers.CsvWriter(AdPerformanceReportParser, io.StringIO())
+        second_writer = writers.CsvWriter(AdPerformanceReportParser, io.StringIO())
+        json_writer = writers.JsonLinesWriter(AdPerformanceReportParser, io.StringIO())
+
+        self.assertIs(first_writer.serializers, second_writer.serializers)
+        self.assertIsNot(first_writer.serializers, json_writer.serializers)
@@ -401,6 +401,138 @@ class ParserWithValidators(unittest.TestCase):
         self.assertEqual(test_object2.errors, ['test_integerfield lower than min'])
 
 
+class FailFastValidationTestCase(unittest.TestCase):
+    def test(self):
+        class A(parser.Parser):
+            test_integerfield = fields.IntegerField(
+                validators=[
+                    validators.IntegerFieldMinValidator(min_value=5),
+                    validators.IntegerFieldMaxValidator(max_value=3),
+                ]
+            )
+            test_charfield = fields.CharField(
+                validators=[
+                    validators.CharFieldMaxLengthValidator(max_length=2),
+                ]
+            )
+
+            fields_order = ['test_integerfield', 'test_charfield']
+
+        test_object = A()
+        test_object.test_integerfield = 4
+        test_object.test_charfield = 'abc'
+
+        self.assertEqual(test_object.is_valid(fail_fast=True), False)
+        self.assertEqual(test_object.errors, ['test_integerfield lower than min'])
+
+        self.assertEqual(test_object.is_valid(), False)
+        self.assertEqual(test_object.errors, ['test_integerfield lower than min',
+                                              'test_integerfield higher than max',
+                                              'test_charfield len higher than max_length'])
+
+    def test_adaptive(self):
+        class A(parser.Parser):
+            test_integerfield = fields.IntegerField(
+                validators=[
+                    validators.IntegerFieldMinValidator(min_value=0),
+                    validators.IntegerFieldMaxValidator(max_value=10),
+                ]
+            )
+            test_charfield = fields.CharField(
+                validators=[
+                    validators.CharFieldMaxLengthValidator(max_length=2),
+                ]
+            )
+
+            fields_order = ['test_integerfield', 'test_charfield']
+            validation_order = 'adaptive'
+
+        stats = A.get_plan().validation_stats
+        stats.reorder_every = 10
+        stats.sample_every = 1000
+
+        test_object = A()
+        for i in range(10):
+            test_object.test_integerfield = 20
+            test_object.test_charfield = 'abc' if i % 2 else 'ab'
+            self.assertEqual(test_object.is_valid(fail_fast=True), False)
+            self.assertEqual(test_object.errors, ['test_integerfield higher than max'])
+
+        self.assertEqual(stats.field_failures, [10, 0])
+        self.assertEqual(stats.validator_orders[0], [A.test_integerfield.validators[1],
+                                                     A.test_integerfield.validators[0]])
+
+        for i in range(10):
+            test_object.test_integerfield = 5
+            test_object.test_charfield = 'abc'
+            self.assertEqual(test_object.is_valid(fail_fast=True), False)
+            self.assertEqual(test_object.errors, ['test_charfield len higher than max_length'])
+
+        self.assertEqual(stats.field_order, [1, 0])
+        test_object.test_integerfield = 20
+        self.assertEqual(test_object.is_valid(fail_fast=True), False)
+        self.assertEqual(test_object.errors, ['test_charfield len higher than max_length'])
+
+        self.assertEqual(test_object.is_valid(), False)
+        self.assertEqual(test_object.errors, ['test_integerfield higher than max',
+                                              'test_charfield len higher than max_length'])
+
+        test_object.test_integerfield = 5
+        test_object.test_charfield = 'ab'
+        self.assertEqual(test_object.is_valid(fail_fast=True), True)
+        self.assertEqual(test_object.errors, [])
+
+    def test_adaptive_with_custom_is_valid(self):
+        class EvenIntegerField(fields.IntegerField):
+            # is_valid overridden without fail_fast, like in fields written before it was added
+            def is_valid(self, instance, cls, field_name):
+                value = self.__get__(instance, cls)
+                setattr(instance, self.errors_field_name, [] if value % 2 == 0 else ['{} is odd'.format(field_name)])
+                return value % 2 == 0
+
+        class A(parser.Parser):
+            test_integerfield = EvenIntegerField()
+            test_charfield = fields.CharField(
+                validators=[
+                    validators.CharFieldMaxLengthValidator(max_length=2),
+                ]
+            )
+
+            fields_order = ['test_integerfield', 'test_charfield']
+            validation_order = 'adaptive'
+
+        test_object = A()
+        test_object.test_integerfield = '3'
+        test_object.test_charfield = 'abc'
+        self.assertEqual(test_object.is_valid(), False)
+        self.assertEqual(test_object.errors, ['test_integerfield is odd', 'test_charfield len higher than max_length'])
+        self.assertEqual(test_object.is_valid(fail_fast=True), False)
+        self.assertEqual(test_object.errors, ['test_integerfield is odd'])
+
+        test_object.test_integerfield = '4'
+        self.assertEqual(test_object.is_valid(fail_fast=True), False)
+        self.assertEqual(test_object.errors, ['test_charfield len higher than max_length'])
+
+    def test_fail_fast_with_custom_is_valid(self):
+        class EvenIntegerField(fields.IntegerField):
+            def is_valid(self, instance, cls, field_name):
+                value = self.__get__(instance, cls)
+                setattr(instance, self.errors_field_name, [] if value % 2 == 0 else ['{} is odd'.format(field_name)])
+                return value % 2 == 0
+
+        class A(parser.Parser):
+            test_integerfield = EvenIntegerField()
+            test_charfield = fields.CharField()
+
+            fields_order = ['test_integerfield', 'test_charfield']
+
+        test_object = A()
+        test_object.test_integerfield = '3'
+        test_object.test_charfield = 'abc'
+        self.assertEqual(test_object.is_valid(fail_fast=True), False)
+        self.assertEqual(test_object.errors, ['test_integerfield is odd'])
+
+
 class ParserWithCustomValidatorTestCase(unittest.TestCase):
     def test(self):
         class AdImageField(fields.ParserField):